@@ -19,8 +19,20 @@ writers
     Contains writers for creating Python wrappers and writing to file.
 """
 
-from cppwg.generators import CppWrapperGenerator
-
 __all__ = [
     "CppWrapperGenerator",
 ]
+
+
+def __getattr__(name: str):
+    """
+    Import the main interface lazily, as it depends on pygccxml.
+
+    This keeps e.g. `cppwg --help` and `cppwg --version` fast.
+    """
+    if name == "CppWrapperGenerator":
+        from cppwg.generators import CppWrapperGenerator
+
+        return CppWrapperGenerator
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,9 @@
 
 import argparse
 import logging
+import os
 
-from cppwg import CppWrapperGenerator
+from cppwg.utils.constants import CPPWG_JOBS_ENV_VAR
 from cppwg.version import __version__
 
 
@@ -69,6 +70,20 @@ def parse_args() -> argparse.Namespace:
         help="List of paths to include directories.",
     )
 
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="Path to a directory for caching parse results and wrapper state between runs.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of worker processes for writing class wrappers (0 for all CPUs)."
+        f" Defaults to ${CPPWG_JOBS_ENV_VAR} if set, otherwise 1.",
+    )
+
     parser.add_argument(
         "-q",
         "--quiet",
@@ -108,10 +123,25 @@ def generate(args: argparse.Namespace) -> None:
     args : argparse.Namespace
         The parsed command line arguments.
     """
+    # Note: imported here so that e.g. --help and --version do not need to
+    # load pygccxml and the rest of the package
+    from cppwg import CppWrapperGenerator
+
     castxml_cflags = None
     if args.std:
         castxml_cflags = f"-std={args.std}"
 
+    # Take the number of jobs from the environment if not given on the command line
+    jobs = args.jobs
+    if jobs is None:
+        jobs_env = os.environ.get(CPPWG_JOBS_ENV_VAR, "").strip()
+        try:
+            jobs = int(jobs_env) if jobs_env else 1
+        except ValueError:
+            logger = logging.getLogger()
+            logger.error(f"Invalid {CPPWG_JOBS_ENV_VAR} value: {jobs_env}")
+            raise
+
     generator = CppWrapperGenerator(
         source_root=args.source_root,
         source_includes=args.includes,
@@ -120,6 +150,8 @@ def generate(args: argparse.Namespace) -> None:
         castxml_binary=args.castxml_binary,
         castxml_cflags=castxml_cflags,
         castxml_compiler=args.castxml_compiler,
+        cache_dir=args.cache_dir,
+        jobs=jobs,
     )
 
     generator.generate()
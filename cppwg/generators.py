@@ -1,13 +1,14 @@
 """The main interface for generating Python wrappers."""
 
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
 import subprocess
 import uuid
-from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pygccxml
 
@@ -18,7 +19,9 @@ from cppwg.templates import pybind11_default as wrapper_templates
 from cppwg.utils import utils
 from cppwg.utils.constants import (
     CPPWG_DEFAULT_WRAPPER_DIR,
+    CPPWG_EXT,
     CPPWG_HEADER_COLLECTION_FILENAME,
+    CPPWG_WRAPPER_CACHE_FILENAME,
 )
 from cppwg.version import __version__ as cppwg_version
 from cppwg.writers.header_collection_writer import CppHeaderCollectionWriter
@@ -45,6 +48,10 @@ class CppWrapperGenerator:
         Optional compiler path to be passed to CastXML
     package_info_path : str
         The path to the package info yaml config file; defaults to "package_info.yaml"
+    cache_dir : Optional[str]
+        Optional directory for caching parsed declarations etc. between runs
+    jobs : int
+        The number of worker processes for writing class wrappers; 0 uses all CPUs
     source_ns : pygccxml.declarations.namespace_t
         The namespace containing C++ declarations parsed from the source tree
     package_info : PackageInfo
@@ -60,6 +67,8 @@ class CppWrapperGenerator:
         package_info_path: Optional[str] = None,
         castxml_cflags: Optional[str] = None,
         castxml_compiler: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        jobs: int = 1,
     ):
         logger = logging.getLogger()
 
@@ -170,6 +179,16 @@ class CppWrapperGenerator:
             else:
                 logger.warning("No package info file found - using default settings.")
 
+        # Sanitize cache_dir
+        self.cache_dir: Optional[str] = None
+        if cache_dir:
+            self.cache_dir = os.path.abspath(cache_dir)
+
+        # Sanitize jobs: use one job per CPU if jobs is 0 or less
+        self.jobs: int = jobs
+        if self.jobs < 1:
+            self.jobs = os.cpu_count() or 1
+
         # Initialize remaining attributes
         self.source_ns: Optional[pygccxml.declarations.namespace_t] = None
 
@@ -194,11 +213,13 @@ class CppWrapperGenerator:
                 if class_info.decls:
                     seen_class_names.update(decl.name for decl in class_info.decls)
 
+        source_prefix = os.path.join(self.source_root, "")
+
         for decl in all_class_decls:
             if decl.name in seen_class_names:
                 continue
 
-            if Path(self.source_root) not in Path(decl.location.file_name).parents:
+            if not os.path.normpath(decl.location.file_name).startswith(source_prefix):
                 continue
 
             seen_class_names.add(decl.name)  # e.g. Foo<2,2>
@@ -230,6 +251,7 @@ class CppWrapperGenerator:
             self.source_includes,
             self.castxml_cflags,
             self.castxml_compiler,
+            self.cache_dir,
         )
         self.source_ns = source_parser.parse()
 
@@ -239,7 +261,9 @@ class CppWrapperGenerator:
         """
         if self.package_info_path:
             # If a package info file exists, parse it to create a PackageInfo object
-            info_parser = PackageInfoParser(self.package_info_path, self.source_root)
+            info_parser = PackageInfoParser(
+                self.package_info_path, self.source_root, self.cache_dir
+            )
             self.package_info = info_parser.parse()
 
         else:
@@ -262,10 +286,144 @@ class CppWrapperGenerator:
         Write the wrapper code for the package.
         """
         package_writer = CppPackageWrapperWriter(
-            self.package_info, wrapper_templates.template_collection, self.wrapper_root
+            self.package_info,
+            wrapper_templates.template_collection,
+            self.wrapper_root,
+            self.jobs,
         )
         package_writer.write()
 
+    def get_wrapper_cache_key(self) -> str:
+        """
+        Get a key for the inputs that determine the generated wrappers.
+
+        The key covers the cppwg version, the command line settings, the
+        package info file, and the size and modification time of every file
+        that the wrappers can depend on. These are the source headers, the
+        files of all parsed declarations (including those outside the source
+        root), the custom generators and the castxml binary.
+
+        Returns
+        -------
+        str
+            The hex digest of the inputs
+        """
+        key = hashlib.sha1()
+
+        settings = [
+            cppwg_version,
+            self.source_root,
+            self.wrapper_root,
+            self.castxml_cflags,
+            str(self.castxml_compiler),
+            *self.source_includes,
+        ]
+        key.update("\n".join(settings).encode("utf-8"))
+
+        if self.package_info_path:
+            with open(self.package_info_path, "rb") as package_info_file:
+                key.update(package_info_file.read())
+
+        file_paths = {self.castxml_binary}
+        file_paths.update(self.package_info.source_hpp_files)
+        file_paths.update(
+            decl.location.file_name
+            for decl in self.source_ns.decls(allow_empty=True)
+            if decl.location and decl.location.file_name
+        )
+
+        for module_info in self.package_info.module_collection:
+            for info in [
+                self.package_info,
+                module_info,
+                *module_info.class_collection,
+                *module_info.free_function_collection,
+            ]:
+                if info.custom_generator:
+                    file_paths.add(info.custom_generator)
+
+        for file_path in sorted(file_paths):
+            try:
+                stat = os.stat(file_path)
+                key.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+            except OSError:
+                key.update(f"{file_path}:missing\n".encode())
+
+        return key.hexdigest()
+
+    def get_wrapper_files(self) -> Dict[str, List[int]]:
+        """
+        Get the size and modification time of the generated wrapper files.
+
+        Returns
+        -------
+        Dict[str, List[int]]
+            The [size, mtime_ns] of each wrapper file, keyed by its path
+            relative to the wrapper root
+        """
+        wrapper_files: Dict[str, List[int]] = {}
+
+        for root, _, filenames in os.walk(self.wrapper_root):
+            for filename in filenames:
+                if f".{CPPWG_EXT}." not in filename:
+                    continue
+                file_path = os.path.join(root, filename)
+                stat = os.stat(file_path)
+                wrapper_files[os.path.relpath(file_path, self.wrapper_root)] = [
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ]
+
+        return wrapper_files
+
+    def wrappers_up_to_date(self, cache_key: str) -> bool:
+        """
+        Check if the wrappers were generated from the same inputs and are intact.
+
+        Parameters
+        ----------
+        cache_key : str
+            The key for the current wrapper inputs
+
+        Returns
+        -------
+        bool
+            True if the cached key matches and the wrapper files are unchanged
+        """
+        logger = logging.getLogger()
+
+        cache_file = os.path.join(self.cache_dir, CPPWG_WRAPPER_CACHE_FILENAME)
+        if not os.path.isfile(cache_file):
+            return False
+
+        try:
+            with open(cache_file, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring invalid wrapper cache: {cache_file}")
+            return False
+
+        if not isinstance(cache, dict) or cache.get("key") != cache_key:
+            return False
+
+        return cache.get("files") == self.get_wrapper_files()
+
+    def save_wrapper_cache(self, cache_key: str) -> None:
+        """
+        Save the wrapper input key and the wrapper files to the cache directory.
+
+        Parameters
+        ----------
+        cache_key : str
+            The key for the current wrapper inputs
+        """
+        cache = {"key": cache_key, "files": self.get_wrapper_files()}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_file = os.path.join(self.cache_dir, CPPWG_WRAPPER_CACHE_FILENAME)
+        with open(cache_file, "w") as f:
+            json.dump(cache, f)
+
     def generate(self) -> None:
         """
         Parse yaml configuration and C++ source to generate Python wrappers.
@@ -288,5 +446,18 @@ class CppWrapperGenerator:
         # Log list of unknown classes in the source root
         self.log_unknown_classes()
 
+        # Skip writing the wrappers if a cache directory is set, and nothing
+        # the wrappers depend on has changed since they were last written
+        cache_key: Optional[str] = None
+        if self.cache_dir:
+            cache_key = self.get_wrapper_cache_key()
+            if self.wrappers_up_to_date(cache_key):
+                logger = logging.getLogger()
+                logger.info("Wrappers are up to date - skipping wrapper generation")
+                return
+
         #  Write the wrapper code for the package
         self.write_wrappers()
+
+        if cache_key:
+            self.save_wrapper_cache(cache_key)
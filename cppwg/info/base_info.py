@@ -67,6 +67,31 @@ class BaseInfo(ABC):
         An instance of the custom generator class.
     """
 
+    __slots__ = (
+        "arg_type_excludes",
+        "calldef_excludes",
+        "constructor_arg_type_excludes",
+        "constructor_signature_excludes",
+        "custom_generator",
+        "custom_generator_instance",
+        "excluded",
+        "excluded_methods",
+        "excluded_variables",
+        "extra_code",
+        "name",
+        "name_replacements",
+        "pointer_call_policy",
+        "prefix_code",
+        "prefix_text",
+        "reference_call_policy",
+        "return_type_excludes",
+        "smart_ptr_type",
+        "source_includes",
+        "source_root",
+        "suffix_code",
+        "template_substitutions",
+    )
+
     def __init__(self, name: str, info_config: Optional[Dict[str, Any]] = None) -> None:
         """
         Create a base info object from a config dict.
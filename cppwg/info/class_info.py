@@ -3,6 +3,7 @@
 import logging
 import os
 import re
+from itertools import chain
 from typing import Any, Dict, List, Optional
 
 from pygccxml.declarations.matchers import access_type_matcher_t
@@ -33,6 +34,13 @@ class CppClassInfo(CppEntityInfo):
         self.cpp_names: List[str] = []
         self.py_names: List[str] = []
 
+        # Memoized results of `extends` and `requires`, keyed by the other class name
+        self._extends_cache: Dict[str, bool] = {}
+        self._requires_cache: Dict[str, bool] = {}
+
+        # Memoized arg types of public methods and constructors, one per line
+        self._public_arg_types: Optional[str] = None
+
     def extract_templates_from_source(self) -> None:
         """
         Extract template args from the associated source file.
@@ -52,13 +60,11 @@ class CppClassInfo(CppEntityInfo):
 
         # Get list of template substitutions applicable to this class
         # e.g. [ {"signature":"<int A, int B>", "replacement":[[2,2], [3,3]]} ]
-        substitutions = [
-            ts_dict
-            for ts_dict_list in self.hierarchy_attribute_gather(
-                "template_substitutions"
+        substitutions = list(
+            chain.from_iterable(
+                self.hierarchy_attribute_gather("template_substitutions")
             )
-            for ts_dict in ts_dict_list
-        ]
+        )
 
         # Skip if there are no applicable template substitutions
         if not substitutions:
@@ -76,13 +82,17 @@ class CppClassInfo(CppEntityInfo):
             # Signature e.g. <int A, int B>
             signature = substitution["signature"].strip()
 
-            class_list = utils.find_classes_in_source(
-                source,
-                class_name=self.name,
-                template_signature=signature,
+            # Only the first match is needed
+            class_match = next(
+                utils.iter_classes_in_source(
+                    source,
+                    class_name=self.name,
+                    template_signature=signature,
+                ),
+                None,
             )
 
-            if class_list:
+            if class_match:
                 self.template_signature = signature
 
                 # Replacement e.g. [[2,2], [3,3]]
@@ -119,7 +129,13 @@ class CppClassInfo(CppEntityInfo):
             return False
         if not other.decls:
             return False
-        return any(decl in other.decls for decl in self.base_decls)
+
+        result = self._extends_cache.get(other.name)
+        if result is None:
+            result = any(decl in other.decls for decl in self.base_decls)
+            self._extends_cache[other.name] = result
+
+        return result
 
     def requires(self, other: "ClassInfo") -> bool:  # noqa: F821
         """
@@ -138,22 +154,46 @@ class CppClassInfo(CppEntityInfo):
         if not self.decls:
             return False
 
-        query = access_type_matcher_t("public")
-        name_regex = re.compile(r"\b" + re.escape(other.name) + r"\b")
+        result = self._requires_cache.get(other.name)
+        if result is None:
+            result = self._requires_name(other.name)
+            self._requires_cache[other.name] = result
+
+        return result
+
+    def _requires_name(self, name: str) -> bool:
+        """
+        Check if the class name is used in public method signatures of this class.
+
+        Parameters
+        ----------
+        name : str
+            The class name to check.
+
+        Returns
+        -------
+        bool
+            True if the class name is used in public method signatures of this class.
+        """
+        # Collect the arg type strings once, as they are searched for the
+        # name of every other class in the module
+        if self._public_arg_types is None:
+            query = access_type_matcher_t("public")
+            arg_types: List[str] = []
+
+            for class_decl in self.decls:
+                for calldef_decl in chain(
+                    class_decl.member_functions(function=query, allow_empty=True),
+                    class_decl.constructors(function=query, allow_empty=True),
+                ):
+                    arg_types.extend(
+                        arg_type.decl_string for arg_type in calldef_decl.argument_types
+                    )
 
-        for class_decl in self.decls:
-            method_decls = class_decl.member_functions(function=query, allow_empty=True)
-            for method_decl in method_decls:
-                for arg_type in method_decl.argument_types:
-                    if name_regex.search(arg_type.decl_string):
-                        return True
+            self._public_arg_types = "\n".join(arg_types)
 
-            ctor_decls = class_decl.constructors(function=query, allow_empty=True)
-            for ctor_decl in ctor_decls:
-                for arg_type in ctor_decl.argument_types:
-                    if name_regex.search(arg_type.decl_string):
-                        return True
-        return False
+        name_regex = re.compile(r"\b" + re.escape(name) + r"\b")
+        return name_regex.search(self._public_arg_types) is not None
 
     def update_from_ns(self, source_ns: "namespace_t") -> None:  # noqa: F821
         """
@@ -172,6 +212,11 @@ class CppClassInfo(CppEntityInfo):
         if self.excluded:
             return
 
+        # Declarations are about to change, so drop any memoized results
+        self._extends_cache.clear()
+        self._requires_cache.clear()
+        self._public_arg_types = None
+
         for class_cpp_name, class_py_name in zip(self.cpp_names, self.py_names):
             try:
                 cpp_name = class_cpp_name.replace(" ", "")  # e.g. Foo<2,2,1>
@@ -221,6 +266,12 @@ class CppClassInfo(CppEntityInfo):
             self.source_file = os.path.basename(self.source_file_path)
         else:
             for file_path in source_file_paths:
+                # Quick check to skip paths that cannot match below
+                if self.name not in file_path and (
+                    not self.source_file or self.source_file not in file_path
+                ):
+                    continue
+
                 file_name = os.path.basename(file_path)
                 # Match file name if set
                 if self.source_file == file_name:
@@ -1,7 +1,7 @@
 """Module information structure."""
 
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from cppwg.info.base_info import BaseInfo
 from cppwg.info.class_info import CppClassInfo
@@ -34,6 +34,20 @@ class ModuleInfo(BaseInfo):
         A list of variable info objects that belong to this module
     """
 
+    __slots__ = (
+        "source_locations",
+        "use_all_classes",
+        "use_all_free_functions",
+        "use_all_variables",
+        "package_info",
+        "class_collection",
+        "free_function_collection",
+        "variable_collection",
+        "_prefix_locations",
+        "_source_prefixes",
+        "_file_in_source_cache",
+    )
+
     def __init__(
         self, name: str, module_config: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -70,6 +84,15 @@ class ModuleInfo(BaseInfo):
                 if key in module_config:
                     setattr(self, key, module_config[key])
 
+        # Source location prefixes e.g. "/path/to/src/", for checking
+        # declaration file locations, and the source locations they were
+        # derived from. See `get_source_prefixes`.
+        self._prefix_locations: Optional[Tuple[str, ...]] = None
+        self._source_prefixes: Tuple[str, ...] = ()
+
+        # Memoized results of source path checks, keyed by file name
+        self._file_in_source_cache: Dict[str, bool] = {}
+
     @property
     def parent(self) -> "PackageInfo":  # noqa: F821
         """
@@ -105,6 +128,29 @@ class ModuleInfo(BaseInfo):
         self.variable_collection.append(variable_info)
         variable_info.parent = self
 
+    def get_source_prefixes(self) -> Tuple[str, ...]:
+        """
+        Get the source location prefixes e.g. "/path/to/src/".
+
+        The prefixes are derived from `source_locations`, and derived again if
+        the source locations have changed since, in which case the memoized
+        source path checks are dropped too.
+
+        Returns
+        -------
+        Tuple[str, ...]
+            The absolute source location paths, each with a trailing separator
+        """
+        locations = tuple(self.source_locations or [])
+        if locations != self._prefix_locations:
+            self._prefix_locations = locations
+            self._source_prefixes = tuple(
+                os.path.join(os.path.abspath(location), "") for location in locations
+            )
+            self._file_in_source_cache.clear()
+
+        return self._source_prefixes
+
     def is_decl_in_source_path(self, decl: "declaration_t") -> bool:  # noqa: F821
         """
         Check if the declaration is associated with a file in the specified source paths.
@@ -119,20 +165,77 @@ class ModuleInfo(BaseInfo):
         bool
             True if the declaration is associated with a file in a specified source path
         """
-        if not self.source_locations:
+        return self.is_file_in_source_path(decl.location.file_name)
+
+    def is_file_in_source_path(self, file_name: str) -> bool:
+        """
+        Check if the file is in the specified source paths.
+
+        Results are memoized by file name, as many declarations share a file.
+
+        Parameters
+        ----------
+        file_name : str
+            The full path to the file
+
+        Returns
+        -------
+        bool
+            True if the file is in a specified source path
+        """
+        source_prefixes = self.get_source_prefixes()
+        if not source_prefixes:
             return True
 
-        for location in self.source_locations:
-            if Path(location) in Path(decl.location.file_name).parents:
-                return True
+        result = self._file_in_source_cache.get(file_name)
+        if result is None:
+            result = os.path.normpath(file_name).startswith(source_prefixes)
+            self._file_in_source_cache[file_name] = result
+
+        return result
+
+    def filter_decls_in_source_path(
+        self, decls: List["declaration_t"]  # noqa: F821
+    ) -> List["declaration_t"]:  # noqa: F821
+        """
+        Filter declarations to those associated with files in the source paths.
+
+        Each distinct file is checked once, rather than once per declaration.
 
-        return False
+        Parameters
+        ----------
+        decls : List[declaration_t]
+            The declarations to filter
+
+        Returns
+        -------
+        List[declaration_t]
+            The declarations in the specified source paths, in the original order
+        """
+        if not self.get_source_prefixes():
+            return list(decls)
+
+        file_names = {decl.location.file_name for decl in decls}
+        in_source_files = {
+            file_name
+            for file_name in file_names
+            if self.is_file_in_source_path(file_name)
+        }
+
+        return [decl for decl in decls if decl.location.file_name in in_source_files]
 
     def sort_classes(self) -> None:
         """
         Sort the class info collection in order of dependence.
         """
-        cache = dict()
+        # Nothing to sort for fewer than two classes
+        if len(self.class_collection) < 2:
+            return
+
+        # Orders already decided, for both (a, b) and (b, a). This keeps the
+        # order consistent in both directions e.g. if a extends b while b
+        # requires a, otherwise the two classes would be swapped forever.
+        cache: Dict[Tuple[CppClassInfo, CppClassInfo], int] = {}
 
         def compare(a: CppClassInfo, b: CppClassInfo) -> int:
             """
@@ -150,40 +253,43 @@ class ModuleInfo(BaseInfo):
                  0 if there is no dependence
                  1 if a comes after b (a depends on b)
             """
-            order = cache.get((a, b), None)
+            order = cache.get((a, b))
             if order is not None:
                 return order
 
-            a_req_b = a.requires(b)
-            b_req_a = b.requires(a)
-            if a.extends(b) or (a_req_b and not b_req_a):
-                # a comes after b (ignore cyclic dependencies)
-                cache[(a, b)] = 1
-                cache[(b, a)] = -1
-                return 1
-            elif b.extends(a) or (b_req_a and not a_req_b):
-                # a comes before b (ignore cyclic dependencies)
-                cache[(a, b)] = -1
-                cache[(b, a)] = 1
-                return -1
-
-            # Order doesn't matter
-            cache[(a, b)] = 0
-            cache[(b, a)] = 0
-            return 0
-
-        self.class_collection.sort(key=lambda x: x.name)
+            # Note: `requires` and `extends` are memoized by the class info objects
+            if a.extends(b):
+                # a comes after b, no need to check `requires`
+                order = 1
+            else:
+                a_req_b = a.requires(b)
+                b_req_a = b.requires(a)
+                if a_req_b and not b_req_a:
+                    # a comes after b (ignore cyclic dependencies)
+                    order = 1
+                elif b.extends(a) or (b_req_a and not a_req_b):
+                    # a comes before b (ignore cyclic dependencies)
+                    order = -1
+                else:
+                    # Order doesn't matter
+                    order = 0
+
+            cache[(a, b)] = order
+            cache[(b, a)] = -order
+            return order
+
+        collection = self.class_collection
+        collection.sort(key=lambda x: x.name)
 
         i = 0
-        n = len(self.class_collection)
+        n = len(collection)
         while i < n - 1:
-            cls_i = self.class_collection[i]
+            cls_i = collection[i]
             ii = i  # Tracks destination of cls_i
             j_pos = []  # Tracks positions of cls_i's dependents
 
             for j in range(i + 1, n):
-                cls_j = self.class_collection[j]
-                order = compare(cls_i, cls_j)
+                order = compare(cls_i, collection[j])
                 if order == 1:
                     # Position cls_i after all classes it depends on
                     ii = j
@@ -195,18 +301,34 @@ class ModuleInfo(BaseInfo):
                 i += 1
                 continue  # No change in position
 
-            # Move cls_i into new position ii
-            cls_i = self.class_collection.pop(i)
-            self.class_collection.insert(ii, cls_i)
-
-            # Move dependents into positions after ii
-            for idx, j in enumerate(j_pos):
-                if j > ii:
-                    break  # Rest of dependents are already positioned after ii
-                cls_j = self.class_collection.pop(j - 1 - idx)
-                self.class_collection.insert(ii + idx, cls_j)
-
-    def update_from_ns(self, source_ns: "namespace_t") -> None:  # noqa: F821
+            # Rebuild the slice from i in one step, instead of shifting the
+            # list with a pop and insert for every moved class: cls_i moves
+            # after the classes it depends on, followed by its dependents.
+            # Each dependent after the first is interleaved with the next class
+            # beyond ii (if any), which keeps the established wrapper order.
+            dependents = [j for j in j_pos if j <= ii]
+            dependent_set = set(dependents)
+
+            window = [
+                collection[j] for j in range(i + 1, ii + 1) if j not in dependent_set
+            ]
+            window.append(cls_i)
+
+            end = ii + 1
+            for idx, j in enumerate(dependents):
+                if idx > 0 and end < n:
+                    window.append(collection[end])
+                    end += 1
+                window.append(collection[j])
+
+            collection[i:end] = window
+
+    def update_from_ns(
+        self,
+        source_ns: "namespace_t",  # noqa: F821
+        class_decls: Optional[List["class_t"]] = None,  # noqa: F821
+        free_function_decls: Optional[List["free_function_t"]] = None,  # noqa: F821
+    ) -> None:
         """
         Update module with information from the source namespace.
 
@@ -214,40 +336,51 @@ class ModuleInfo(BaseInfo):
         ----------
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
+        class_decls : Optional[List[pygccxml.declarations.class_t]]
+            All class declarations in the source namespace, if already queried
+        free_function_decls : Optional[List[pygccxml.declarations.free_function_t]]
+            All free function declarations in the source namespace, if already queried
         """
         # Add discovered classes: if `use_all_classes` is True, this module
         # has no class info objects. Use class declarations from the
         # source namespace to create class info objects.
         if self.use_all_classes:
-            class_decls = source_ns.classes(allow_empty=True)
-            for class_decl in class_decls:
-                if self.is_decl_in_source_path(class_decl):
-                    class_info = CppClassInfo(class_decl.name)
-                    class_info.update_names()
-                    class_info.module_info = self
-                    self.class_collection.append(class_info)
-
-        # Update classes with information from source namespace.
-        for class_info in self.class_collection:
-            class_info.update_from_ns(source_ns)
-
-        # Sort classes by dependence
-        self.sort_classes()
+            if class_decls is None:
+                class_decls = source_ns.classes(allow_empty=True)
+            class_decls = self.filter_decls_in_source_path(class_decls)
+            class_infos = [CppClassInfo(class_decl.name) for class_decl in class_decls]
+            for class_info in class_infos:
+                class_info.update_names()
+                class_info.module_info = self
+            self.class_collection.extend(class_infos)
+
+        if self.class_collection:
+            # Update classes with information from source namespace.
+            for class_info in self.class_collection:
+                class_info.update_from_ns(source_ns)
+
+            # Sort classes by dependence
+            self.sort_classes()
 
         # Add discovered free functions: if `use_all_free_functions` is True,
         # this module has no free function info objects. Use free function
         # decls from the source namespace to create free function info objects.
         if self.use_all_free_functions:
-            free_functions = source_ns.free_functions(allow_empty=True)
-            for free_function in free_functions:
-                if self.is_decl_in_source_path(free_function):
-                    ff_info = CppFreeFunctionInfo(free_function.name)
-                    ff_info.module_info = self
-                    self.free_function_collection.append(ff_info)
-
-        # Update free functions with information from source namespace.
-        for ff_info in self.free_function_collection:
-            ff_info.update_from_ns(source_ns)
+            if free_function_decls is None:
+                free_function_decls = source_ns.free_functions(allow_empty=True)
+            free_functions = self.filter_decls_in_source_path(free_function_decls)
+            ff_infos = [
+                CppFreeFunctionInfo(free_function.name)
+                for free_function in free_functions
+            ]
+            for ff_info in ff_infos:
+                ff_info.module_info = self
+            self.free_function_collection.extend(ff_infos)
+
+        if self.free_function_collection:
+            # Update free functions with information from source namespace.
+            for ff_info in self.free_function_collection:
+                ff_info.update_from_ns(source_ns)
 
     def update_from_source(self, source_file_paths: List[str]) -> None:
         """
@@ -3,8 +3,7 @@
 import fnmatch
 import logging
 import os
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from cppwg.info.base_info import BaseInfo
 from cppwg.utils.constants import CPPWG_EXT
@@ -27,10 +26,18 @@ class PackageInfo(BaseInfo):
 
     module_collection : List[ModuleInfo]
         A list of module info objects associated with this package
-    source_hpp_files : List[str]
-        A list of source file names to include
+    source_hpp_files : Tuple[str, ...]
+        The source file names to include, sorted by file name
     """
 
+    __slots__ = (
+        "common_include_file",
+        "exclude_default_args",
+        "source_hpp_patterns",
+        "module_collection",
+        "source_hpp_files",
+    )
+
     def __init__(
         self, name: str, package_config: Optional[Dict[str, Any]] = None
     ) -> None:
@@ -51,7 +58,7 @@ class PackageInfo(BaseInfo):
         self.source_hpp_patterns: List[str] = ["*.hpp"]
 
         self.module_collection: List["ModuleInfo"] = []  # noqa: F821
-        self.source_hpp_files: List[str] = []
+        self.source_hpp_files: Tuple[str, ...] = ()
 
         if package_config:
             self.common_include_file = package_config.get(
@@ -109,30 +116,37 @@ class PackageInfo(BaseInfo):
         """
         logger = logging.getLogger()
 
-        for root, _, filenames in os.walk(self.source_root, followlinks=True):
-            for pattern in self.source_hpp_patterns:
-                for filename in fnmatch.filter(filenames, pattern):
-                    filepath = os.path.abspath(os.path.join(root, filename))
+        source_hpp_files: List[str] = []
+
+        restricted = frozenset(os.path.abspath(path) for path in restricted_paths)
 
-                    # Skip files in restricted paths
-                    for restricted_path in restricted_paths:
-                        if Path(restricted_path) in Path(filepath).parents:
-                            continue
+        for root, dirnames, filenames in os.walk(self.source_root, followlinks=True):
+            # Skip restricted directories and everything below them
+            if restricted:
+                dirnames[:] = [
+                    dirname
+                    for dirname in dirnames
+                    if os.path.abspath(os.path.join(root, dirname)) not in restricted
+                ]
 
+            for pattern in self.source_hpp_patterns:
+                for filename in fnmatch.filter(filenames, pattern):
                     # Skip files with the extensions like .cppwg.hpp
                     suffix = os.path.splitext(os.path.splitext(filename)[0])[1]
                     if suffix == CPPWG_EXT:
                         continue
 
-                    self.source_hpp_files.append(filepath)
+                    filepath = os.path.abspath(os.path.join(root, filename))
+                    source_hpp_files.append(filepath)
 
         # Check if any source files were found
-        if not self.source_hpp_files:
+        if not source_hpp_files:
             logger.error(f"No header files found in source root: {self.source_root}")
             raise FileNotFoundError()
 
-        # Sort by filename
-        self.source_hpp_files.sort(key=lambda x: os.path.basename(x))
+        # Sort by filename, and store as a tuple as the collection is now fixed
+        source_hpp_files.sort(key=lambda x: os.path.basename(x))
+        self.source_hpp_files = tuple(source_hpp_files)
 
     def update_from_source(self) -> None:
         """
@@ -150,5 +164,17 @@ class PackageInfo(BaseInfo):
         source_ns : pygccxml.declarations.namespace_t
             The source namespace
         """
+        # Query the namespace once for all modules, rather than once per module.
+        # Skip the queries if no module will use the results.
+        class_decls = None
+        if any(module_info.use_all_classes for module_info in self.module_collection):
+            class_decls = source_ns.classes(allow_empty=True)
+
+        free_function_decls = None
+        if any(
+            module_info.use_all_free_functions for module_info in self.module_collection
+        ):
+            free_function_decls = source_ns.free_functions(allow_empty=True)
+
         for module_info in self.module_collection:
-            module_info.update_from_ns(source_ns)
+            module_info.update_from_ns(source_ns, class_decls, free_function_decls)
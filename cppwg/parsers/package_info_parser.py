@@ -1,10 +1,10 @@
 """Parser for input yaml."""
 
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict
-
-import yaml
+from typing import Any, Dict, Optional
 
 from cppwg.info.class_info import CppClassInfo
 from cppwg.info.free_function_info import CppFreeFunctionInfo
@@ -12,7 +12,40 @@ from cppwg.info.module_info import ModuleInfo
 from cppwg.info.package_info import PackageInfo
 from cppwg.info.variable_info import CppVariableInfo
 from cppwg.utils import utils
-from cppwg.utils.constants import CPPWG_SOURCEROOT_STRING
+from cppwg.utils.constants import (
+    CPPWG_PACKAGE_INFO_CACHE_FILENAME,
+    CPPWG_SOURCEROOT_STRING,
+)
+
+# Default config options for the package, modules, and C++ entities (classes,
+# free functions and variables). These are shared, so should not be modified;
+# `update_config` copies any default lists left in a config.
+PACKAGE_CONFIG_DEFAULTS: Dict[str, Any] = {
+    "name": "cppwg_package",
+    "common_include_file": True,
+    "exclude_default_args": False,
+    "source_hpp_patterns": ["*.hpp"],
+}
+
+MODULE_CONFIG_DEFAULTS: Dict[str, Any] = {
+    "name": "cppwg_module",
+    "source_locations": [],
+    "use_all_classes": False,
+    "use_all_free_functions": False,
+    "use_all_variables": False,
+    "classes": [],
+    "free_functions": [],
+    "variables": [],
+}
+
+CPP_ENTITY_CONFIG_DEFAULTS: Dict[str, Any] = {
+    "name_override": "",
+    "source_file": "",
+    "source_file_path": "",
+}
+
+# Keys in the package info yaml that describe its structure, not config options
+STRUCTURE_KEYS = frozenset({"name", "modules"})
 
 
 class PackageInfoParser:
@@ -25,11 +58,96 @@ class PackageInfoParser:
             The path to the package info yaml config file
         source_root : str
             The root directory of the C++ source code
+        cache_dir : Optional[str]
+            Optional directory for caching the loaded yaml between runs
     """
 
-    def __init__(self, config_file: str, source_root: str):
+    def __init__(
+        self, config_file: str, source_root: str, cache_dir: Optional[str] = None
+    ):
         self.config_file = config_file
         self.source_root = source_root
+        self.cache_dir = cache_dir
+
+    def load_yaml(self, config_bytes: bytes) -> Dict[str, Any]:
+        """
+        Load yaml from the contents of the package info file.
+
+        Note: yaml is imported here rather than at the top of the module, as it
+        is not needed when the cached package info is used.
+
+        Parameters
+        ----------
+        config_bytes : bytes
+            The contents of the package info yaml file
+
+        Returns
+        -------
+        Dict[str, Any]
+            The loaded yaml
+        """
+        import yaml
+
+        # Use the faster LibYAML based loader if available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+        return yaml.load(config_bytes, Loader=loader)
+
+    def load_raw_package_info(self) -> Dict[str, Any]:
+        """
+        Load the raw package info from the yaml file.
+
+        If a cache directory is set, the loaded yaml is cached as json, keyed
+        by the sha1 digest of the yaml file. The cached copy is used instead
+        of parsing the yaml again if the file is unchanged.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The raw package info loaded from the yaml file.
+        """
+        logger = logging.getLogger()
+
+        with open(self.config_file, "rb") as config_file:
+            config_bytes = config_file.read()
+
+        if not self.cache_dir:
+            return self.load_yaml(config_bytes)
+
+        cache_file = os.path.join(self.cache_dir, CPPWG_PACKAGE_INFO_CACHE_FILENAME)
+        cache_key = hashlib.sha1(config_bytes).hexdigest()
+
+        # Use the cached copy if it was created from the same yaml
+        if os.path.isfile(cache_file):
+            try:
+                with open(cache_file, "r") as f:
+                    cache = json.load(f)
+                if cache.get("key") == cache_key:
+                    logger.info(f"Using cached package info: {cache_file}")
+                    return cache["package_info"]
+            except (OSError, ValueError, AttributeError, KeyError):
+                logger.warning(f"Ignoring invalid package info cache: {cache_file}")
+
+        raw_package_info = self.load_yaml(config_bytes)
+
+        # Only cache yaml that loads back from json unchanged e.g. skip
+        # yaml with non-string keys, which json would convert to strings.
+        cache = {"key": cache_key, "package_info": raw_package_info}
+        try:
+            cache_text = json.dumps(cache)
+        except (TypeError, ValueError):
+            # e.g. yaml dates and sets, which have no json equivalent
+            logger.debug(
+                f"Not caching package info, as it is not valid json: {cache_file}"
+            )
+            return raw_package_info
+
+        if json.loads(cache_text) == cache:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_file, "w") as f:
+                f.write(cache_text)
+
+        return raw_package_info
 
     def parse(self) -> PackageInfo:
         """
@@ -47,10 +165,7 @@ class PackageInfoParser:
         logger.info("Parsing package info file.")
 
         # Load raw info from the yaml file
-        raw_package_info: Dict[str, Any] = {}
-
-        with open(self.config_file, "r") as config_file:
-            raw_package_info = yaml.safe_load(config_file)
+        raw_package_info: Dict[str, Any] = self.load_raw_package_info()
 
         # Base config options that apply to package, modules, classes, etc.
         base_config: Dict[str, Any] = {
@@ -74,26 +189,21 @@ class PackageInfoParser:
             "template_substitutions": [],
         }
 
-        # Get package config from the raw package info
-        package_config: Dict[str, Any] = {
-            "name": "cppwg_package",
-            "common_include_file": True,
-            "exclude_default_args": False,
-            "source_hpp_patterns": ["*.hpp"],
+        # Default config for classes, free functions and variables; this is
+        # merged once here and copied for each entity below.
+        cpp_entity_config_defaults: Dict[str, Any] = {
+            **CPP_ENTITY_CONFIG_DEFAULTS,
+            **base_config,
         }
-        package_config.update(base_config)
 
-        for key in package_config.keys():
-            if key in raw_package_info:
-                package_config[key] = raw_package_info[key]
+        # Get package config from the raw package info
+        package_config: Dict[str, Any] = {**PACKAGE_CONFIG_DEFAULTS, **base_config}
+
+        self.update_config(package_config, raw_package_info)
 
         # Replace boolean strings with booleans
-        package_config["common_include_file"] = utils.convert_to_bool(
-            package_config["common_include_file"]
-        )
-        package_config["exclude_default_args"] = utils.convert_to_bool(
-            package_config["exclude_default_args"]
-        )
+        for key in ("common_include_file", "exclude_default_args"):
+            package_config[key] = utils.convert_to_bool(package_config[key])
 
         # Convert custom generator path to a full path
         self.convert_custom_generator(package_config)
@@ -104,21 +214,9 @@ class PackageInfoParser:
         # Parse the module data
         for raw_module_info in raw_package_info["modules"]:
             # Get module config from the raw module info
-            module_config = {
-                "name": "cppwg_module",
-                "source_locations": [],
-                "use_all_classes": False,
-                "use_all_free_functions": False,
-                "use_all_variables": False,
-                "classes": [],
-                "free_functions": [],
-                "variables": [],
-            }
-            module_config.update(base_config)
-
-            for key in module_config.keys():
-                if key in raw_module_info:
-                    module_config[key] = raw_module_info[key]
+            module_config = {**MODULE_CONFIG_DEFAULTS, **base_config}
+
+            self.update_config(module_config, raw_module_info)
 
             # Convert source locations to full paths
             if module_config["source_locations"]:
@@ -157,16 +255,9 @@ class PackageInfoParser:
                 if module_config["classes"]:
                     for raw_class_info in module_config["classes"]:
                         # Get class config from the raw class info
-                        class_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        class_config.update(base_config)
+                        class_config = dict(cpp_entity_config_defaults)
 
-                        for key in class_config.keys():
-                            if key in raw_class_info:
-                                class_config[key] = raw_class_info[key]
+                        self.update_config(class_config, raw_class_info)
 
                         # Convert source file path to a full path
                         class_config["source_file_path"] = self.full_path(
@@ -190,16 +281,9 @@ class PackageInfoParser:
                 if module_config["free_functions"]:
                     for raw_free_function_info in module_config["free_functions"]:
                         # Get free function config from the raw free function info
-                        free_function_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        free_function_config.update(base_config)
+                        free_function_config = dict(cpp_entity_config_defaults)
 
-                        for key in free_function_config.keys():
-                            if key in raw_free_function_info:
-                                free_function_config[key] = raw_free_function_info[key]
+                        self.update_config(free_function_config, raw_free_function_info)
 
                         # Convert source file path to a full path
                         free_function_config["source_file_path"] = self.full_path(
@@ -223,16 +307,9 @@ class PackageInfoParser:
                 if module_config["variables"]:
                     for raw_variable_info in module_config["variables"]:
                         # Get variable config from the raw variable info
-                        variable_config = {
-                            "name_override": "",
-                            "source_file": "",
-                            "source_file_path": "",
-                        }
-                        variable_config.update(base_config)
+                        variable_config = dict(cpp_entity_config_defaults)
 
-                        for key in variable_config.keys():
-                            if key in raw_variable_info:
-                                variable_config[key] = raw_variable_info[key]
+                        self.update_config(variable_config, raw_variable_info)
 
                         # Convert source file path to a full path
                         variable_config["source_file_path"] = self.full_path(
@@ -253,6 +330,37 @@ class PackageInfoParser:
 
         return package_info
 
+    def update_config(self, config: Dict[str, Any], raw_config: Dict[str, Any]) -> None:
+        """
+        Update config values with those set in the raw config.
+
+        Only keys already in the config are updated. A warning is logged for any
+        other keys, which are ignored. Lists not set in the raw config are
+        copied, as the config defaults they come from are shared.
+
+        Parameters
+        ----------
+        config: Dict[str, Any]
+            The config dictionary to update.
+        raw_config: Dict[str, Any]
+            The raw config dictionary from the yaml file.
+        """
+        unknown_keys = raw_config.keys() - config.keys() - STRUCTURE_KEYS
+        if unknown_keys:
+            logger = logging.getLogger()
+            name = raw_config.get("name", "")
+            logger.warning(
+                f"Ignoring unknown options for {name}: {', '.join(sorted(unknown_keys))}"
+            )
+
+        for key, value in config.items():
+            if isinstance(value, list) and key not in raw_config:
+                config[key] = list(value)
+
+        config.update(
+            {key: value for key, value in raw_config.items() if key in config}
+        )
+
     def convert_custom_generator(self, config: Dict[str, Any]) -> None:
         """
         Convert the custom generator path to a full path if set in the config.
@@ -1,14 +1,16 @@
 """Parser for C++ source code."""
 
+import hashlib
 import logging
-from pathlib import Path
-from typing import List
+import os
+from typing import Dict, List, Optional
 
 from pygccxml import declarations, parser
 from pygccxml.declarations import declaration_t
-from pygccxml.declarations.mdecl_wrapper import mdecl_wrapper_t
 from pygccxml.declarations.namespace import namespace_t
 
+from cppwg.utils.constants import CPPWG_PARSER_CACHE_FILENAME
+
 # declaration_t is the base type for all declarations in pygccxml including:
 # - class_declaration_t (pygccxml.declarations.class_declaration.class_declaration_t)
 # - class_t (pygccxml.declarations.class_declaration.class_t)
@@ -28,6 +30,8 @@ class CppSourceParser:
 
     Attributes
     ----------
+        cache_dir : Optional[str]
+            Optional directory for caching parsed declarations between runs
         castxml_cflags : str
             Optional cflags to be passed to CastXML e.g. "-std=c++17"
         castxml_compiler : str
@@ -50,6 +54,7 @@ class CppSourceParser:
         source_includes: List[str],
         castxml_cflags: str = "",
         castxml_compiler: str = None,
+        cache_dir: Optional[str] = None,
     ):
         self.source_root: str = source_root
         self.wrapper_header_collection: str = wrapper_header_collection
@@ -57,6 +62,33 @@ class CppSourceParser:
         self.source_includes: List[str] = source_includes
         self.castxml_cflags: str = castxml_cflags
         self.castxml_compiler: str = castxml_compiler
+        self.cache_dir: Optional[str] = cache_dir
+
+    def get_cache_file(self) -> str:
+        """
+        Get the path to the declarations cache file in the cache directory.
+
+        pygccxml validates cached declarations against the CastXML binary path,
+        cflags and include paths, but not the compiler used by CastXML or an
+        upgrade of either binary in place. The cache file name is keyed by the
+        path and modification time of both binaries, so that a different
+        toolchain uses a separate cache.
+
+        Returns
+        -------
+        str
+            The path to the cache file
+        """
+        key = hashlib.sha1()
+        for binary in (self.castxml_binary, self.castxml_compiler):
+            if not binary:
+                continue
+            key.update(binary.encode("utf-8"))
+            if os.path.isfile(binary):
+                key.update(str(os.path.getmtime(binary)).encode("utf-8"))
+
+        cache_filename = CPPWG_PARSER_CACHE_FILENAME.format(key=key.hexdigest()[:16])
+        return os.path.join(self.cache_dir, cache_filename)
 
     def parse(self) -> namespace_t:
         """
@@ -79,30 +111,62 @@ class CppSourceParser:
         )
         logger.info(f"Using compiler: {xml_generator_config.compiler_path}")
 
+        # Use a declarations cache if a cache directory is specified. The cache
+        # is keyed by the header collection, the sha1 digests of all included
+        # files and the generator configuration, so any change causes a re-parse.
+        # Note: pygccxml only uses the cache when parsing file by file, which is
+        # equivalent to parsing all at once for the single header collection.
+        cache: Optional[parser.file_cache_t] = None
+        compilation_mode = parser.COMPILATION_MODE.ALL_AT_ONCE
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_file = self.get_cache_file()
+            logger.info(f"Using declarations cache: {cache_file}")
+
+            cache = parser.file_cache_t(cache_file)
+            compilation_mode = parser.COMPILATION_MODE.FILE_BY_FILE
+
         # Parse all the C++ source code to extract declarations
         logger.info("Parsing source code for declarations.")
         decls: List[declaration_t] = parser.parse(
             files=[self.wrapper_header_collection],
             config=xml_generator_config,
-            compilation_mode=parser.COMPILATION_MODE.ALL_AT_ONCE,
+            compilation_mode=compilation_mode,
+            cache=cache,
         )
 
         # Get access to the global namespace containing all parsed C++ declarations
         global_ns: namespace_t = declarations.get_global_namespace(decls)
 
-        # Filter declarations for which files exist
-        logger.info("Filtering source declarations.")
-        query = declarations.custom_matcher_t(lambda decl: decl.location is not None)
-        filtered_decls: mdecl_wrapper_t = global_ns.decls(function=query)
-
         # Filter declarations in our source tree; include declarations from the
         # wrapper_header_collection file for explicit instantiations, typedefs etc.
-        source_decls: List[declaration_t] = [
-            decl
-            for decl in filtered_decls
-            if Path(self.source_root) in Path(decl.location.file_name).parents
-            or decl.location.file_name == self.wrapper_header_collection
-        ]
+        # Declarations without a location (e.g. built-ins) are skipped.
+        logger.info("Filtering source declarations.")
+        source_prefix = os.path.join(self.source_root, "")
+        header_collection = self.wrapper_header_collection
+
+        # Memoized results of the check for each file, as many declarations
+        # share a file. File names are normalized, as headers included with
+        # relative paths can have names like /path/to/src/foo/../bar/Bar.hpp
+        file_in_source: Dict[str, bool] = {}
+
+        source_decls: List[declaration_t] = []
+        for decl in declarations.make_flatten(global_ns.declarations):
+            if decl.location is None:
+                continue
+
+            file_name = decl.location.file_name
+            in_source = file_in_source.get(file_name)
+            if in_source is None:
+                in_source = (
+                    os.path.normpath(file_name).startswith(source_prefix)
+                    or file_name == header_collection
+                )
+                file_in_source[file_name] = in_source
+
+            if in_source:
+                source_decls.append(decl)
 
         # Create a source namespace module for the filtered declarations
         source_ns = namespace_t(name="source", declarations=source_decls)
@@ -6,9 +6,15 @@ CPPWG_ALL_STRING = "CPPWG_ALL"
 CPPWG_EXT = "cppwg"
 CPPWG_HEADER_COLLECTION_FILENAME = f"wrapper_header_collection.{CPPWG_EXT}.hpp"
 
-CPPWG_TRUE_STRINGS = ["ON", "YES", "Y", "TRUE", "T", "1"]
-CPPWG_FALSE_STRINGS = ["OFF", "NO", "N", "FALSE", "F", "0", ""]
+CPPWG_TRUE_STRINGS = frozenset({"ON", "YES", "Y", "TRUE", "T", "1"})
+CPPWG_FALSE_STRINGS = frozenset({"OFF", "NO", "N", "FALSE", "F", "0", ""})
 
 CPPWG_DEFAULT_WRAPPER_DIR = "cppwg_wrappers"
 
+CPPWG_PARSER_CACHE_FILENAME = "parser_cache_{key}.pkl"
+CPPWG_PACKAGE_INFO_CACHE_FILENAME = "package_info_cache.json"
+CPPWG_WRAPPER_CACHE_FILENAME = "wrapper_cache.json"
+
 CPPWG_CLASS_OVERRIDE_SUFFIX = "_Overrides"
+
+CPPWG_JOBS_ENV_VAR = "CPPWG_JOBS"
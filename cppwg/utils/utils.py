@@ -1,12 +1,21 @@
 """Utility functions for the cppwg package."""
 
 import ast
+import functools
+import os
 import re
 from numbers import Number
-from typing import Any, List, Tuple
+from typing import Any, Iterator, List, Tuple
 
 from cppwg.utils.constants import CPPWG_ALL_STRING, CPPWG_TRUE_STRINGS
 
+# Precompiled regexes for stripping C++ source. Line and block comments are
+# matched in a single left to right scan, so that comment markers inside other
+# comments are ignored e.g. the "//" in "/* https://... */".
+COMMENT_REGEX = re.compile(r"//.*|/\*(?s:.*?)\*/")
+PREPROCESSOR_REGEX = re.compile(r"#.*")
+WHITESPACE_REGEX = re.compile(r"\s+")
+
 
 def convert_to_bool(value: Any) -> bool:
     """
@@ -72,6 +81,61 @@ def find_classes_in_source(
     List[Tuple[str, str, str]]
         A list of (struct/class, class_name, inheritance) tuples
     """
+    regex = class_regex(class_name, template_signature)
+    classes = regex.findall(source)
+
+    return classes
+
+
+def iter_classes_in_source(
+    source: str,
+    class_name: str = None,
+    template_signature: str = None,
+) -> Iterator[Tuple[str, str, str]]:
+    """
+    Iterate over class definitions in a C++ source string.
+
+    Unlike `find_classes_in_source`, the source is only scanned as far as
+    needed, so callers can stop at the first match.
+
+    Parameters
+    ----------
+    source : str
+        The source string
+    class_name : str
+        The class name to search for; if None, all classes are returned.
+    template_signature : str
+        The template signature to search for.
+
+    Yields
+    ------
+    Tuple[str, str, str]
+        (struct/class, class_name, inheritance) tuples
+    """
+    regex = class_regex(class_name, template_signature)
+    for match in regex.finditer(source):
+        yield match.groups("")
+
+
+@functools.lru_cache(maxsize=None)
+def class_regex(class_name: str = None, template_signature: str = None) -> re.Pattern:
+    """
+    Build a compiled regex to find class definitions in a C++ source string.
+
+    Results are cached, as the same class is searched for in several sources.
+
+    Parameters
+    ----------
+    class_name : str
+        The class name to search for; if None, the regex matches all classes.
+    template_signature : str
+        The template signature to search for.
+
+    Returns
+    -------
+    re.Pattern
+        The compiled regex, with (struct/class, class_name, inheritance) groups
+    """
     regex = r"\b"
 
     if template_signature:
@@ -89,9 +153,7 @@ def find_classes_in_source(
     regex += r"\s*(?::\s*([^{;]+))?\s*"  # Inheritance
     regex += r"\{"  # Start of class body
 
-    classes = re.findall(regex, source)
-
-    return classes
+    return re.compile(regex)
 
 
 def find_classes_in_source_file(
@@ -157,10 +219,58 @@ def read_source_file(
     str
         The source file as a string
     """
-    source = ""
+    return _read_source_file(
+        source_file_path,
+        os.path.getmtime(source_file_path),
+        strip_comments,
+        strip_preprocessor,
+        strip_whitespace,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_source_file(
+    source_file_path: str,
+    mtime: float,
+    strip_comments: bool,
+    strip_preprocessor: bool,
+    strip_whitespace: bool,
+) -> str:
+    """
+    Read and strip a C++ source file, caching the result.
+
+    Results are cached so that each file is only read and stripped once, even
+    when it is requested for several classes. The modification time is part of
+    the cache key, so edited files are read again.
+
+    Parameters
+    ----------
+    source_file_path : str
+        The path to the source file
+    mtime : float
+        The modification time of the source file
+    strip_comments : bool
+        Strip comments from the source file
+    strip_preprocessor : bool
+        Strip preprocessor directive lines from the source file
+    strip_whitespace : bool
+        Strip whitespace from the source file
 
+    Returns
+    -------
+    str
+        The source file as a string
+    """
     with open(source_file_path, "r") as source_file:
-        source = "\n".join(line.rstrip() for line in source_file)
+        source = source_file.read()
+
+    if not strip_whitespace:
+        # Strip trailing whitespace from each line. This is not needed if all
+        # non-essential whitespace is being stripped below.
+        lines = source.split("\n")
+        if source.endswith("\n"):
+            lines.pop()
+        source = "\n".join(line.rstrip() for line in lines)
 
     source = strip_source(
         source,
@@ -172,6 +282,46 @@ def read_source_file(
     return source
 
 
+def write_source_file(file_path: str, content: str) -> bool:
+    """
+    Write a generated source file as UTF-8 bytes.
+
+    The file is written in binary mode with a single write, which skips the
+    text I/O layer's incremental encoding and newline translation. The output
+    is the same on every platform and locale.
+
+    If the file already has the same contents, it is not rewritten. This keeps
+    its modification time, so build tools do not recompile unchanged wrappers.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file to write
+    content : str
+        The file contents
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode("utf-8")
+
+    # Only read existing files of the same size, as others must have changed
+    try:
+        if os.path.getsize(file_path) == len(data):
+            with open(file_path, "rb") as in_file:
+                if in_file.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    with open(file_path, "wb") as out_file:
+        out_file.write(data)
+
+    return True
+
+
 def str_to_num(expr: str, integer: bool = False) -> Number:
     """
     Convert a literal string expression to a number e.g. "(-1)" to -1.
@@ -223,6 +373,8 @@ def strip_source(
     str
         The stripped source string
     """
+    # Note: comments must be stripped first, as a block comment that starts on
+    # a preprocessor line may continue onto later lines.
     if strip_comments:
         source = strip_source_comments(source)
 
@@ -249,12 +401,33 @@ def strip_source_comments(source: str) -> str:
     str
         The source string with comments stripped
     """
-    source = re.sub(r"//.*", "", source)
-    source = re.sub(r"/\*.*?\*/", " ", source, flags=re.DOTALL)
+    source = COMMENT_REGEX.sub(_replace_comment, source)
 
     return source
 
 
+def _replace_comment(match: re.Match) -> str:
+    """
+    Get the replacement for a matched comment.
+
+    Block comments are replaced by a space as they may separate tokens, while
+    line comments are removed.
+
+    Parameters
+    ----------
+    match : re.Match
+        The matched comment
+
+    Returns
+    -------
+    str
+        The replacement string
+    """
+    if match.group().startswith("/*"):
+        return " "
+    return ""
+
+
 def strip_source_preprocessor(source: str) -> str:
     """
     Strip preprocessor directives from a C++ source string.
@@ -269,7 +442,7 @@ def strip_source_preprocessor(source: str) -> str:
     str
         The source string with preprocessor directives stripped
     """
-    source = re.sub(r"#.*", "", source)
+    source = PREPROCESSOR_REGEX.sub("", source)
 
     return source
 
@@ -288,8 +461,19 @@ def strip_source_whitespace(source: str) -> str:
     str
         The source string with whitespace stripped
     """
-    source = re.sub(r"[\r\n]", " ", source)
-    source = re.sub(r"\b\s+|\s+\b", " ", source)
-    source = re.sub(r"\B\s+|\s+\B", "", source)
-
-    return source
+    n = len(source)
+
+    def replace(match: re.Match) -> str:
+        # Keep a single space between two word characters e.g. "unsigned int",
+        # and remove any other whitespace e.g. "Foo < int >" -> "Foo<int>".
+        # Note: `\w` matches alphanumeric characters and the underscore.
+        start, end = match.span()
+        if start == 0 or end == n:
+            return ""
+        before = source[start - 1]
+        after = source[end]
+        if (before.isalnum() or before == "_") and (after.isalnum() or after == "_"):
+            return " "
+        return ""
+
+    return WHITESPACE_REGEX.sub(replace, source)
@@ -1,7 +1,127 @@
 """Base for wrapper code writers."""
 
-from collections import OrderedDict
-from typing import Dict
+import re
+import string
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Replacements, in order, for tidying up C++ declarations for use in typedefs
+TIDY_REPLACEMENTS: Tuple[Tuple[str, str], ...] = (
+    (" ", ""),
+    (",", "_"),
+    ("<", "_lt_"),
+    (">", "_gt_"),
+    ("::", "_"),
+    ("*", "Ptr"),
+    ("&", "Ref"),
+    ("-", "neg"),
+)
+
+
+@lru_cache(maxsize=None)
+def compile_template(template: str) -> Callable[[Mapping[str, Any]], str]:
+    """
+    Compile a wrapper template into a function that fills in its placeholders.
+
+    The template is parsed once, instead of on every call to `format_map`.
+    Templates with placeholders other than plain names (e.g. positional
+    fields, conversions or format specs) use `format_map` directly.
+
+    Parameters
+    ----------
+    template : str
+        A template string with named placeholders e.g. "class {class_py_name}"
+
+    Returns
+    -------
+    Callable[[Mapping[str, Any]], str]
+        A function taking a mapping of placeholder values and returning the
+        filled in template, equivalent to `template.format_map`
+    """
+    parts: List[Tuple[str, Optional[str]]] = []
+
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (
+            not field.isidentifier() or spec or conversion is not None
+        ):
+            return template.format_map
+        parts.append((literal, field))
+
+    def render(values: Mapping[str, Any]) -> str:
+        return "".join(
+            [
+                literal if field is None else literal + format(values[field])
+                for literal, field in parts
+            ]
+        )
+
+    return render
+
+
+@lru_cache(maxsize=None)
+def tidy_cpp_name(name: str) -> str:
+    """
+    Replace full C++ declarations with a simple version for use in typedefs.
+
+    Results are cached, as the same types recur across many methods.
+
+    Example:
+    "::foo::bar<double, 2>" -> "_foo_bar_lt_double_2_gt_"
+
+    Parameters
+    ----------
+    name : str
+        The C++ declaration to tidy up
+
+    Returns
+    -------
+    str
+        The tidied up C++ declaration
+    """
+    for key, value in TIDY_REPLACEMENTS:
+        name = name.replace(key, value)
+
+    return name
+
+
+@lru_cache(maxsize=None)
+def compile_template_arg_substitution(
+    class_name: str, template_params: Tuple[str, ...], template_args: Tuple[str, ...]
+) -> Callable[[str], str]:
+    """
+    Compile a function that replaces template params with their template args.
+
+    All the params are matched in a single regex pass. A param may be qualified
+    by the class name e.g. for class Foo, both "Foo::DIM_A" and "DIM_A" are
+    replaced with "2".
+
+    Parameters
+    ----------
+    class_name : str
+        The name of the templated class e.g. "Foo"
+    template_params : Tuple[str, ...]
+        The template params e.g. ("DIM_A", "DIM_B")
+    template_args : Tuple[str, ...]
+        The template args for one instantiation e.g. ("2", "2")
+
+    Returns
+    -------
+    Callable[[str], str]
+        A function that substitutes template args into a string
+        e.g. "std::vector<double>(Foo::DIM_A)" -> "std::vector<double>(2)"
+    """
+    param_map = dict(zip(template_params, template_args))
+
+    # Longer params first, so that e.g. "DIM_AB" is not matched as "DIM_A"
+    params = sorted(param_map, key=len, reverse=True)
+    param_regex = re.compile(
+        rf"\b(?:{re.escape(class_name)}::)?({'|'.join(map(re.escape, params))})\b"
+    )
+
+    def substitute(text: str) -> str:
+        return param_regex.sub(lambda match: param_map[match.group(1)], text)
+
+    return substitute
 
 
 class CppBaseWrapperWriter:
@@ -12,24 +132,30 @@ class CppBaseWrapperWriter:
     ----------
     wrapper_templates : Dict[str, str]
         String templates with placeholders for generating wrapper code
-    tidy_replacements : OrderedDict[str, str]
-        A dictionary of replacements to use when tidying up C++ declarations
     """
 
+    __slots__ = ("wrapper_templates",)
+
     def __init__(self, wrapper_templates: Dict[str, str]) -> None:
         self.wrapper_templates = wrapper_templates
-        self.tidy_replacements = OrderedDict(
-            [
-                (" ", ""),
-                (",", "_"),
-                ("<", "_lt_"),
-                (">", "_gt_"),
-                ("::", "_"),
-                ("*", "Ptr"),
-                ("&", "Ref"),
-                ("-", "neg"),
-            ]
-        )
+
+    def fill_template(self, template_name: str, values: Mapping[str, Any]) -> str:
+        """
+        Fill in the placeholders of a wrapper template.
+
+        Parameters
+        ----------
+        template_name : str
+            The name of the template in wrapper_templates e.g. "class_method"
+        values : Mapping[str, Any]
+            The placeholder values e.g. {"class_py_name": "Foo_2_2"}
+
+        Returns
+        -------
+        str
+            The filled in template
+        """
+        return compile_template(self.wrapper_templates[template_name])(values)
 
     def tidy_name(self, name: str) -> str:
         """
@@ -48,7 +174,4 @@ class CppBaseWrapperWriter:
         str
             The tidied up C++ declaration
         """
-        for key, value in self.tidy_replacements.items():
-            name = name.replace(key, value)
-
-        return name
+        return tidy_cpp_name(name)
@@ -2,18 +2,20 @@
 
 import logging
 import os
-from typing import Dict, List
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from pygccxml.declarations import type_traits_classes
 from pygccxml.declarations.matchers import access_type_matcher_t
 
+from cppwg.utils import utils
 from cppwg.utils.constants import (
     CPPWG_CLASS_OVERRIDE_SUFFIX,
     CPPWG_EXT,
     CPPWG_HEADER_COLLECTION_FILENAME,
 )
-from cppwg.writers.base_writer import CppBaseWrapperWriter
-from cppwg.writers.constructor_writer import CppConstructorWrapperWriter
+from cppwg.writers.base_writer import CppBaseWrapperWriter, compile_template
+from cppwg.writers.constructor_writer import CppConstructorWrapperWriter, CtorExcludes
 from cppwg.writers.method_writer import CppMethodWrapperWriter
 
 
@@ -31,10 +33,26 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
         A dictionary of decls and names for all classes in the module
     has_shared_ptr : bool
         Whether the class uses shared pointers
-    hpp_string : str
-        The hpp wrapper code
-    cpp_string : str
-        The cpp wrapper code
+    prefix_text : str
+        Text to add at the top of the wrappers, from the info tree
+    smart_ptr_type : str
+        The smart pointer type for the class, from the info tree
+    smart_ptr_handle : str
+        The smart pointer holder declaration, if a smart pointer type is set
+    includes : Optional[str]
+        The include lines for the class wrapper cpp files, once built
+    ctor_excludes : CtorExcludes
+        Constructor exclude patterns for the class, from the info tree
+    method_excludes : Tuple[FrozenSet[str], FrozenSet[str]]
+        Method exclude patterns for the class, from the info tree
+    exclude_default_args : bool
+        Whether to leave out default arg values in constructors and methods
+    call_policies : Tuple[Optional[str], Optional[str]]
+        Method return value policies for pointers and references
+    hpp_parts : List[str]
+        Pieces of the hpp wrapper code, joined and written to file at once
+    cpp_parts : List[str]
+        Pieces of the cpp wrapper code, joined and written to file at once
     """
 
     def __init__(
@@ -57,8 +75,73 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
 
         self.has_shared_ptr: bool = True
 
-        self.hpp_string: str = ""
-        self.cpp_string: str = ""
+        # Look up info tree attributes once, rather than once per template
+        # instantiation or once per constructor
+        self.prefix_text: str = self.class_info.hierarchy_attribute("prefix_text")
+        self.smart_ptr_type: str = self.class_info.hierarchy_attribute("smart_ptr_type")
+        self.ctor_excludes: CtorExcludes = CppConstructorWrapperWriter.gather_excludes(
+            self.class_info
+        )
+        self.method_excludes: Tuple[FrozenSet[str], FrozenSet[str]] = (
+            CppMethodWrapperWriter.gather_excludes(self.class_info)
+        )
+        self.exclude_default_args: bool = bool(
+            self.class_info.hierarchy_attribute("exclude_default_args")
+        )
+        self.call_policies: Tuple[Optional[str], Optional[str]] = (
+            CppMethodWrapperWriter.gather_call_policies(self.class_info)
+        )
+
+        # Check for custom smart pointers e.g. "boost::shared_ptr"
+        self.smart_ptr_handle: str = ""
+        if self.smart_ptr_type:
+            # Adds e.g. "PYBIND11_DECLARE_HOLDER_TYPE(T, boost::shared_ptr<T>)"
+            self.smart_ptr_handle = self.wrapper_templates[
+                "smart_pointer_holder"
+            ].format(self.smart_ptr_type)
+
+        # The include lines are the same for every template instantiation
+        self.includes: Optional[str] = None
+
+        self.hpp_parts: List[str] = []
+        self.cpp_parts: List[str] = []
+
+    def get_includes(self) -> str:
+        """
+        Get the include lines for the class wrapper cpp files.
+
+        The include lines are built on the first call and reused for all
+        template instantiations of the class.
+
+        Returns
+        -------
+        str
+            The include lines for the class, one per line
+        """
+        if self.includes is not None:
+            return self.includes
+
+        if self.class_info.hierarchy_attribute("common_include_file"):
+            includes = [f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n']
+
+        else:
+            # e.g. #include <string> or #include "Foo.hpp"
+            includes = [
+                (f"#include {inc}\n" if inc.startswith("<") else f'#include "{inc}"\n')
+                for inc in chain.from_iterable(
+                    self.class_info.hierarchy_attribute_gather("source_includes")
+                )
+            ]
+
+            source_file = self.class_info.source_file
+            if not source_file:
+                source_file = os.path.basename(
+                    self.class_info.decls[0].location.file_name
+                )
+            includes.append(f'#include "{source_file}"\n')
+
+        self.includes = "".join(includes)
+        return self.includes
 
     def add_hpp(self, class_py_name: str) -> None:
         """
@@ -70,16 +153,13 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
             The Python name of the class e.g. Foo_2_2
         """
         # Add the top prefix text
-        prefix_text = self.class_info.hierarchy_attribute("prefix_text")
-        if prefix_text:
-            self.hpp_string += prefix_text + "\n"
+        if self.prefix_text:
+            self.hpp_parts.append(self.prefix_text + "\n")
 
         # Add the header guard, includes and declarations
         class_hpp_dict = {"class_py_name": class_py_name}
 
-        self.hpp_string += self.wrapper_templates["class_hpp_header"].format(
-            **class_hpp_dict
-        )
+        self.hpp_parts.append(self.fill_template("class_hpp_header", class_hpp_dict))
 
     def add_cpp_header(self, class_cpp_name: str, class_py_name: str) -> None:
         """
@@ -93,73 +173,32 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
             The Python name of the class e.g. Foo_2_2
         """
         # Add the top prefix text
-        prefix_text = self.class_info.hierarchy_attribute("prefix_text")
-        if prefix_text:
-            self.cpp_string += prefix_text + "\n"
-
-        # Add the includes for this class
-        includes = ""
-
-        if self.class_info.hierarchy_attribute("common_include_file"):
-            includes += f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n'
-
-        else:
-            source_includes = [
-                inc
-                for inc_list in self.class_info.hierarchy_attribute_gather(
-                    "source_includes"
-                )
-                for inc in inc_list
-            ]
-
-            for source_include in source_includes:
-                if source_include[0] == "<":
-                    # e.g. #include <string>
-                    includes += f"#include {source_include}\n"
-                else:
-                    # e.g. #include "Foo.hpp"
-                    includes += f'#include "{source_include}"\n'
-
-            source_file = self.class_info.source_file
-            if not source_file:
-                source_file = os.path.basename(
-                    self.class_info.decls[0].location.file_name
-                )
-            includes += f'#include "{source_file}"\n'
-
-        # Check for custom smart pointers e.g. "boost::shared_ptr"
-        smart_ptr_type: str = self.class_info.hierarchy_attribute("smart_ptr_type")
-
-        smart_ptr_handle = ""
-        if smart_ptr_type:
-            # Adds e.g. "PYBIND11_DECLARE_HOLDER_TYPE(T, boost::shared_ptr<T>)"
-            smart_ptr_handle = self.wrapper_templates["smart_pointer_holder"].format(
-                smart_ptr_type
-            )
+        if self.prefix_text:
+            self.cpp_parts.append(self.prefix_text + "\n")
 
         # Fill in the cpp header template
         header_dict = {
-            "includes": includes,
+            "includes": self.get_includes(),
             "class_py_name": class_py_name,
             "class_cpp_name": class_cpp_name,
-            "smart_ptr_handle": smart_ptr_handle,
+            "smart_ptr_handle": self.smart_ptr_handle,
         }
 
-        self.cpp_string += self.wrapper_templates["class_cpp_header"].format(
-            **header_dict
-        )
+        self.cpp_parts.append(self.fill_template("class_cpp_header", header_dict))
 
         # Add any specified custom prefix code
         for code_line in self.class_info.prefix_code:
-            self.cpp_string += code_line + "\n"
+            self.cpp_parts.append(code_line + "\n")
 
         # Run any custom generators to add additional prefix code
         generator = self.class_info.custom_generator_instance
         if generator:
-            self.cpp_string += generator.get_class_cpp_pre_code(class_py_name)
+            self.cpp_parts.append(generator.get_class_cpp_pre_code(class_py_name))
 
     def add_virtual_overrides(
-        self, template_idx: int
+        self,
+        template_idx: int,
+        member_functions: Optional[List["member_function_t"]] = None,  # noqa: F821
     ) -> List["member_function_t"]:  # noqa: F821
         """
         Add virtual "trampoline" overrides for the class.
@@ -171,70 +210,85 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
         ----------
         template_idx : int
             The index of the template in the class info
+        member_functions : Optional[List[pygccxml.declarations.member_function_t]]
+            All member functions of the class, if already queried
 
         Returns
         -------
         list[pygccxml.declarations.member_function_t]: A list of member functions needing override
         """
         methods_needing_override: List["member_function_t"] = []  # noqa: F821
-        return_types: List[str] = []  # e.g. ["void", "unsigned int", "::Bar<2> *"]
 
-        # Collect all virtual methods and their return types
-        class_decl = self.class_info.decls[template_idx]
+        # Collect all virtual methods
+        if member_functions is None:
+            class_decl = self.class_info.decls[template_idx]
+            member_functions = class_decl.member_functions(allow_empty=True)
 
-        for member_function in class_decl.member_functions(allow_empty=True):
-            is_pure_virtual = member_function.virtuality == "pure virtual"
-            is_virtual = member_function.virtuality == "virtual"
-            if is_pure_virtual or is_virtual:
+        for member_function in member_functions:
+            if member_function.virtuality in ("virtual", "pure virtual"):
                 methods_needing_override.append(member_function)
-                return_types.append(member_function.return_type.decl_string)
+
+        # Nothing more to add for classes without virtual methods (the usual case)
+        if not methods_needing_override:
+            self.cpp_parts.append("\n")
+            return methods_needing_override
+
+        # Method writers hold the return and arg type strings of each method
+        method_writers = [
+            CppMethodWrapperWriter(
+                self.class_info,
+                template_idx,
+                method,
+                self.wrapper_templates,
+                self.method_excludes,
+                exclude_default_args=self.exclude_default_args,
+                call_policies=self.call_policies,
+            )
+            for method in methods_needing_override
+        ]
 
         # Add typedefs for return types with special characters
         # e.g. typedef ::Bar<2> * _Bar_lt_2_gt_Ptr;
-        for return_type in return_types:
-            if return_type != self.tidy_name(return_type):
-                typedef_template = "typedef {class_cpp_name} {tidy_name};\n"
+        fill_typedef = compile_template("typedef {class_cpp_name} {tidy_name};\n")
+        for method_writer in method_writers:
+            return_type = method_writer.return_type
+            tidy_name = self.tidy_name(return_type)
+            if return_type != tidy_name:
                 typedef_dict = {
                     "class_cpp_name": return_type,
-                    "tidy_name": self.tidy_name(return_type),
+                    "tidy_name": tidy_name,
                 }
-                self.cpp_string += typedef_template.format(**typedef_dict)
-        self.cpp_string += "\n"
+                self.cpp_parts.append(fill_typedef(typedef_dict))
+        self.cpp_parts.append("\n")
 
         # Override virtual methods
         class_py_name = self.class_info.py_names[template_idx]
-        if methods_needing_override:
-            # Add virtual override class, e.g.:
-            #   class Foo_Overrides : public Foo {
-            #       public:
-            #       using Foo::Foo;
-            override_header_dict = {
-                "class_py_name": class_py_name,
-                "class_base_name": self.class_info.name,
-            }
 
-            self.cpp_string += self.wrapper_templates[
-                "class_virtual_override_header"
-            ].format(**override_header_dict)
-
-            # Override each method, e.g.:
-            #   void bar(double d) const override {
-            #       PYBIND11_OVERRIDE_PURE(
-            #           bar,
-            #           Foo_2_2,
-            #           bar,
-            #           d);
-            #   }
-            for method in methods_needing_override:
-                method_writer = CppMethodWrapperWriter(
-                    self.class_info,
-                    template_idx,
-                    method,
-                    self.wrapper_templates,
-                )
-                self.cpp_string += method_writer.generate_virtual_override_wrapper()
+        # Add virtual override class, e.g.:
+        #   class Foo_Overrides : public Foo {
+        #       public:
+        #       using Foo::Foo;
+        override_header_dict = {
+            "class_py_name": class_py_name,
+            "class_base_name": self.class_info.name,
+        }
+
+        self.cpp_parts.append(
+            self.fill_template("class_virtual_override_header", override_header_dict)
+        )
+
+        # Override each method, e.g.:
+        #   void bar(double d) const override {
+        #       PYBIND11_OVERRIDE_PURE(
+        #           bar,
+        #           Foo_2_2,
+        #           bar,
+        #           d);
+        #   }
+        for method_writer in method_writers:
+            self.cpp_parts.append(method_writer.generate_virtual_override_wrapper())
 
-            self.cpp_string += "};\n\n"
+        self.cpp_parts.append("};\n\n")
 
         return methods_needing_override
 
@@ -256,8 +310,8 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
         for idx, class_cpp_name in enumerate(self.class_info.cpp_names):
             class_py_name = self.class_info.py_names[idx]
             class_decl = self.class_info.decls[idx]
-            self.hpp_string = ""
-            self.cpp_string = ""
+            self.hpp_parts = []
+            self.cpp_parts = []
 
             # Add the cpp file header
             self.add_cpp_header(class_cpp_name, class_py_name)
@@ -275,14 +329,16 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
                     enum_tpl += '    py::enum_<{class}::{enum}>(myclass, "{enum}")\n'
 
                     replacements = {"class": class_decl.name, "enum": enums[0].name}
-                    self.cpp_string += enum_tpl.format(**replacements)
+                    self.cpp_parts.append(compile_template(enum_tpl)(replacements))
 
-                    value_tpl = '        .value("{val}", {class}::{enum}::{val})\n'
+                    fill_value = compile_template(
+                        '        .value("{val}", {class}::{enum}::{val})\n'
+                    )
                     for value in enums[0].values:
                         replacements["val"] = value[0]
-                        self.cpp_string += value_tpl.format(**replacements)
+                        self.cpp_parts.append(fill_value(replacements))
 
-                    self.cpp_string += "    .export_values();\n}\n"
+                    self.cpp_parts.append("    .export_values();\n}\n")
 
                     # Set up the hpp
                     self.add_hpp(class_py_name)
@@ -291,8 +347,12 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
                     self.write_files(work_dir, class_py_name)
                 continue
 
+            # Query the member functions once, for use in the overrides, the
+            # constructor exclusion check and the public method wrappers
+            member_functions = class_decl.member_functions(allow_empty=True)
+
             # Find and define virtual function "trampoline" overrides
-            methods_needing_override = self.add_virtual_overrides(idx)
+            methods_needing_override = self.add_virtual_overrides(idx, member_functions)
 
             # Add the virtual "trampoline" overrides from "Foo_Overrides" to
             # the "Foo" wrapper class definition if needed
@@ -303,14 +363,13 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
 
             # Add smart pointer support to the wrapper class definition if needed
             # e.g. py::class_<Foo, boost::shared_ptr<Foo > >(m, "Foo")
-            smart_ptr_type: str = self.class_info.hierarchy_attribute("smart_ptr_type")
             ptr_support = ""
-            if self.has_shared_ptr and smart_ptr_type:
-                ptr_support = f", {smart_ptr_type}<{class_py_name}>"
+            if self.has_shared_ptr and self.smart_ptr_type:
+                ptr_support = f", {self.smart_ptr_type}<{class_py_name}>"
 
             # Add base classes to the wrapper class definition if needed
             # e.g. py::class_<Foo, AbstractFoo, InterfaceFoo >(m, "Foo")
-            bases = ""
+            bases: List[str] = []
 
             for base in class_decl.bases:  # type(base) -> hierarchy_info_t
                 # Check that the base class is not private
@@ -318,56 +377,66 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
                     continue
 
                 # Check if the base class is also wrapped in the module
-                if base.related_class in self.module_classes:
-                    bases += f", {self.module_classes[base.related_class]}"
+                base_name = self.module_classes.get(base.related_class)
+                if base_name is not None:
+                    bases.append(f", {base_name}")
 
             # Add the class registration
             class_definition_dict = {
                 "class_py_name": class_py_name,
                 "overrides_string": overrides_string,
                 "ptr_support": ptr_support,
-                "bases": bases,
+                "bases": "".join(bases),
             }
-            class_definition_template = self.wrapper_templates["class_definition"]
-            self.cpp_string += class_definition_template.format(**class_definition_dict)
+            self.cpp_parts.append(
+                self.fill_template("class_definition", class_definition_dict)
+            )
 
-            # Add public constructors
-            query = access_type_matcher_t("public")
-            for constructor in class_decl.constructors(
-                function=query, allow_empty=True
+            # Add public constructors, unless all are excluded for the class
+            if not CppConstructorWrapperWriter.exclude_class(
+                class_decl, member_functions
             ):
-                constructor_writer = CppConstructorWrapperWriter(
-                    self.class_info,
-                    idx,
-                    constructor,
-                    self.wrapper_templates,
-                )
-                self.cpp_string += constructor_writer.generate_wrapper()
+                query = access_type_matcher_t("public")
+                for constructor in class_decl.constructors(
+                    function=query, allow_empty=True
+                ):
+                    constructor_writer = CppConstructorWrapperWriter(
+                        self.class_info,
+                        idx,
+                        constructor,
+                        self.wrapper_templates,
+                        self.ctor_excludes,
+                        check_class=False,
+                        exclude_default_args=self.exclude_default_args,
+                    )
+                    self.cpp_parts.append(constructor_writer.generate_wrapper())
 
             # Add public member functions
-            query = access_type_matcher_t("public")
-            for member_function in class_decl.member_functions(
-                function=query, allow_empty=True
-            ):
+            for member_function in member_functions:
+                if member_function.access_type != "public":
+                    continue
                 method_writer = CppMethodWrapperWriter(
                     self.class_info,
                     idx,
                     member_function,
                     self.wrapper_templates,
+                    self.method_excludes,
+                    exclude_default_args=self.exclude_default_args,
+                    call_policies=self.call_policies,
                 )
-                self.cpp_string += method_writer.generate_wrapper()
+                self.cpp_parts.append(method_writer.generate_wrapper())
 
             # Run any custom generators to add additional class code
             generator = self.class_info.custom_generator_instance
             if generator:
-                self.cpp_string += generator.get_class_cpp_def_code(class_py_name)
+                self.cpp_parts.append(generator.get_class_cpp_def_code(class_py_name))
 
             # Add any specified custom suffix code
             for code_line in self.class_info.suffix_code:
-                self.cpp_string += code_line + "\n"
+                self.cpp_parts.append(code_line + "\n")
 
             # Close the class definition
-            self.cpp_string += "    ;\n}\n"
+            self.cpp_parts.append("    ;\n}\n")
 
             # Set up the hpp
             self.add_hpp(class_py_name)
@@ -389,8 +458,5 @@ class CppClassWrapperWriter(CppBaseWrapperWriter):
         hpp_filepath = os.path.join(work_dir, f"{class_py_name}.{CPPWG_EXT}.hpp")
         cpp_filepath = os.path.join(work_dir, f"{class_py_name}.{CPPWG_EXT}.cpp")
 
-        with open(hpp_filepath, "w") as hpp_file:
-            hpp_file.write(self.hpp_string)
-
-        with open(cpp_filepath, "w") as cpp_file:
-            cpp_file.write(self.cpp_string)
+        utils.write_source_file(hpp_filepath, "".join(self.hpp_parts))
+        utils.write_source_file(cpp_filepath, "".join(self.cpp_parts))
@@ -1,12 +1,20 @@
 """Wrapper code writer for C++ class constructors."""
 
 import re
-from typing import Dict
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
 
 from pygccxml.declarations import type_traits, type_traits_classes
 
 from cppwg.utils import utils
-from cppwg.writers.base_writer import CppBaseWrapperWriter
+from cppwg.writers.base_writer import (
+    CppBaseWrapperWriter,
+    compile_template_arg_substitution,
+)
+
+# Constructor exclude patterns for a class: calldef_excludes, a pattern matching
+# any of the constructor_arg_type_excludes, and constructor_signature_excludes
+CtorExcludes = Tuple[FrozenSet[str], Optional[Pattern[str]], List[List[str]]]
 
 
 class CppConstructorWrapperWriter(CppBaseWrapperWriter):
@@ -31,14 +39,44 @@ class CppConstructorWrapperWriter(CppBaseWrapperWriter):
         The template params for the class e.g. ['DIM_A', 'DIM_B']
     template_args: Optional[List[str]]
         The template args for the class e.g. ['2', '2']
+    calldef_excludes : FrozenSet[str]
+        Arg types to exclude, with spaces removed
+    ctor_arg_type_excludes : Optional[Pattern[str]]
+        A pattern matching any arg type substring to exclude, with spaces removed
+    ctor_signature_excludes : List[List[str]]
+        Constructor signatures to exclude
+    arg_types : List[str]
+        The constructor argument types e.g. ['int', 'bool']
+    check_class : bool
+        Whether to check if all constructors of the class are excluded
+    exclude_default_args : bool
+        Whether to leave out default arg values
     """
 
+    __slots__ = (
+        "class_info",
+        "ctor_decl",
+        "class_decl",
+        "class_py_name",
+        "template_params",
+        "template_args",
+        "arg_types",
+        "calldef_excludes",
+        "ctor_arg_type_excludes",
+        "ctor_signature_excludes",
+        "exclude_default_args",
+        "check_class",
+    )
+
     def __init__(
         self,
         class_info: "CppClassInfo",  # noqa: F821
         template_idx: int,
         ctor_decl: "constructor_t",  # noqa: F821
         wrapper_templates: Dict[str, str],
+        excludes: Optional[CtorExcludes] = None,
+        check_class: bool = True,
+        exclude_default_args: Optional[bool] = None,
     ) -> None:
         super().__init__(wrapper_templates)
 
@@ -56,30 +94,134 @@ class CppConstructorWrapperWriter(CppBaseWrapperWriter):
         if class_info.template_arg_lists:
             self.template_args = class_info.template_arg_lists[template_idx]
 
-    def exclude(self) -> bool:
+        # Type strings are formatted on each access, so get them once
+        # Read the types from the args directly, as argument_types builds a
+        # new list on each access
+        self.arg_types: List[str] = [
+            arg.decl_type.decl_string for arg in ctor_decl.arguments
+        ]
+
+        # Exclude patterns may be gathered once per class and passed in
+        if excludes is None:
+            excludes = self.gather_excludes(class_info)
+
+        (
+            self.calldef_excludes,
+            self.ctor_arg_type_excludes,
+            self.ctor_signature_excludes,
+        ) = excludes
+
+        # Whether to drop default arg values, which may be looked up once per
+        # class and passed in
+        if exclude_default_args is None:
+            exclude_default_args = bool(
+                class_info.hierarchy_attribute("exclude_default_args")
+            )
+        self.exclude_default_args: bool = exclude_default_args
+
+        # The class check may be done once per class by the caller instead
+        self.check_class = check_class
+
+    @staticmethod
+    def gather_excludes(
+        class_info: "CppClassInfo",  # noqa: F821
+    ) -> CtorExcludes:
         """
-        Check if the constructor should be excluded from the wrapper code.
+        Gather constructor exclude patterns for a class from the info tree.
+
+        Parameters
+        ----------
+        class_info : CppClassInfo
+            The class information
+
+        Returns
+        -------
+        CtorExcludes
+            The set of calldef_excludes with spaces removed, a compiled pattern
+            matching any of the constructor_arg_type_excludes with spaces removed
+            (or None if there are none), and the constructor_signature_excludes
+        """
+        calldef_excludes = frozenset(
+            ex.replace(" ", "")
+            for ex in chain.from_iterable(
+                class_info.hierarchy_attribute_gather("calldef_excludes")
+            )
+        )
+
+        ctor_arg_type_excludes = [
+            ex.replace(" ", "")
+            for ex in chain.from_iterable(
+                class_info.hierarchy_attribute_gather("constructor_arg_type_excludes")
+            )
+        ]
+
+        # Match all the arg type patterns in one search per arg type
+        ctor_arg_type_pattern = None
+        if ctor_arg_type_excludes:
+            ctor_arg_type_pattern = re.compile(
+                "|".join(re.escape(ex) for ex in ctor_arg_type_excludes)
+            )
+
+        ctor_signature_excludes = list(
+            chain.from_iterable(
+                class_info.hierarchy_attribute_gather("constructor_signature_excludes")
+            )
+        )
+
+        return calldef_excludes, ctor_arg_type_pattern, ctor_signature_excludes
+
+    @staticmethod
+    def exclude_class(
+        class_decl: "class_t",  # noqa: F821
+        member_functions: Optional[List["member_function_t"]] = None,  # noqa: F821
+    ) -> bool:
+        """
+        Check if all constructors of the class should be excluded.
+
+        Parameters
+        ----------
+        class_decl : pygccxml.declarations.class_t
+            The class declaration
+        member_functions : Optional[List[pygccxml.declarations.member_function_t]]
+            All member functions of the class, if already queried
 
         Returns
         -------
         bool
-            True if the constructor should be excluded, False otherwise
+            True if the class constructors should be excluded, False otherwise
         """
         # Exclude constructors for classes with private pure virtual methods
+        if member_functions is None:
+            member_functions = class_decl.member_functions(allow_empty=True)
+
         if any(
             mf.virtuality == "pure virtual" and mf.access_type == "private"
-            for mf in self.class_decl.member_functions(allow_empty=True)
+            for mf in member_functions
         ):
             return True
 
         # Exclude constructors for abstract classes inheriting from abstract bases
-        if self.class_decl.is_abstract and len(self.class_decl.recursive_bases) > 0:
+        if class_decl.is_abstract and len(class_decl.recursive_bases) > 0:
             if any(
-                base.related_class.is_abstract
-                for base in self.class_decl.recursive_bases
+                base.related_class.is_abstract for base in class_decl.recursive_bases
             ):
                 return True
 
+        return False
+
+    def exclude(self) -> bool:
+        """
+        Check if the constructor should be excluded from the wrapper code.
+
+        Returns
+        -------
+        bool
+            True if the constructor should be excluded, False otherwise
+        """
+        # Exclude all constructors for some classes
+        if self.check_class and self.exclude_class(self.class_decl):
+            return True
+
         # Exclude sub class (e.g. iterator) constructors such as:
         #   class Foo {
         #     public:
@@ -96,52 +238,25 @@ class CppConstructorWrapperWriter(CppBaseWrapperWriter):
 
         # Get arg type strings with spaces removed
         # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsignedint>const&
-        arg_types = [
-            x.decl_string.replace(" ", "") for x in self.ctor_decl.argument_types
-        ]
+        arg_types = [arg_type.replace(" ", "") for arg_type in self.arg_types]
 
-        # Exclude constructors with "iterator" in args
         for arg_type in arg_types:
+            # Exclude constructors with "iterator" in args
             if "iterator" in arg_type.lower():
                 return True
 
-        # Exclude constructors with args matching patterns in calldef_excludes
-        calldef_excludes = [
-            ex
-            for ex_list in self.class_info.hierarchy_attribute_gather(
-                "calldef_excludes"
-            )
-            for ex in ex_list
-        ]
-        calldef_excludes = [ex.replace(" ", "") for ex in calldef_excludes]
-        for arg_type in arg_types:
-            if arg_type in calldef_excludes:
+            # Exclude constructors with args matching patterns in calldef_excludes
+            if arg_type in self.calldef_excludes:
                 return True
 
-        # Exclude constructors with args matching patterns in constructor_arg_type_excludes
-        ctor_arg_type_excludes = [
-            ex
-            for ex_list in self.class_info.hierarchy_attribute_gather(
-                "constructor_arg_type_excludes"
-            )
-            for ex in ex_list
-        ]
-        ctor_arg_type_excludes = [ex.replace(" ", "") for ex in ctor_arg_type_excludes]
-        for exclude_type in ctor_arg_type_excludes:
-            for arg_type in arg_types:
-                if exclude_type in arg_type:
-                    return True
+            # Exclude constructors with args matching patterns in constructor_arg_type_excludes
+            if self.ctor_arg_type_excludes and self.ctor_arg_type_excludes.search(
+                arg_type
+            ):
+                return True
 
         # Exclude constructors matching a signature in constructor_signature_excludes
-        ctor_signature_excludes = [
-            ex
-            for ex_list in self.class_info.hierarchy_attribute_gather(
-                "constructor_signature_excludes"
-            )
-            for ex in ex_list
-        ]
-
-        for exclude_types in ctor_signature_excludes:
+        for exclude_types in self.ctor_signature_excludes:
             if len(exclude_types) != len(arg_types):
                 continue
 
@@ -169,46 +284,29 @@ class CppConstructorWrapperWriter(CppBaseWrapperWriter):
         if self.exclude():
             return ""
 
-        # Get the arg signature e.g. "int, bool"
-        wrapper_string = "        .def(py::init<"
-
-        arg_types = [t.decl_string for t in self.ctor_decl.argument_types]
-        wrapper_string += ", ".join(arg_types)
-
-        wrapper_string += ">()"
+        substitute_template_args = None
+        if self.template_params:
+            substitute_template_args = compile_template_arg_substitution(
+                self.class_info.name,
+                tuple(self.template_params),
+                tuple(str(arg) for arg in self.template_args),
+            )
 
         # Keyword args with default values e.g. py::arg("i") = 1
-        keyword_args = ""
-        for arg in self.ctor_decl.arguments:
-            keyword_args += f', py::arg("{arg.name}")'
+        keyword_args: List[str] = []
+        for arg, arg_type in zip(self.ctor_decl.arguments, self.arg_types):
+            keyword_args.append(f', py::arg("{arg.name}")')
 
-            if not (
-                arg.default_value is None
-                or self.class_info.hierarchy_attribute("exclude_default_args")
-            ):
+            if not (arg.default_value is None or self.exclude_default_args):
                 # Try to convert "(-1)" to "-1" etc.
                 default_value = str(arg.default_value)
-                value = utils.str_to_num(
-                    default_value, integer="int" in str(arg.decl_type)
-                )
+                value = utils.str_to_num(default_value, integer="int" in arg_type)
                 if value is not None:
                     default_value = str(value)
 
-                # Check for template params in default value
-                if self.template_params:
-                    for param, val in zip(self.template_params, self.template_args):
-                        if param in default_value:
-                            # Replace e.g. Foo::DIM_A -> 2
-                            default_value = re.sub(
-                                f"\\b{self.class_info.name}::{param}\\b",
-                                str(val),
-                                default_value,
-                            )
-
-                            # Replace e.g. <DIM_A> -> <2>
-                            default_value = re.sub(
-                                f"\\b{param}\\b", f"{val}", default_value
-                            )
+                # Replace template params in default value e.g. Foo::DIM_A -> 2
+                if substitute_template_args:
+                    default_value = substitute_template_args(default_value)
 
                 # Add type if default value is an empty initializer list
                 # Example:
@@ -219,8 +317,12 @@ class CppConstructorWrapperWriter(CppBaseWrapperWriter):
                     decl_type = type_traits.remove_const(arg.decl_type)
                     default_value = decl_type.decl_string + " {}"
 
-                keyword_args += f" = {default_value}"
+                keyword_args.append(f" = {default_value}")
+
+        # Get the arg signature e.g. "int, bool"
+        arg_signature = ", ".join(self.arg_types)
 
-        wrapper_string += keyword_args + ")\n"
+        wrapper_string = f"        .def(py::init<{arg_signature}>()"
+        wrapper_string += "".join(keyword_args) + ")\n"
 
         return wrapper_string
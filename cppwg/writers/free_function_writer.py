@@ -1,6 +1,6 @@
 """Wrapper code writer for C++ free functions."""
 
-from typing import Dict, List
+from typing import List
 
 from cppwg.info.free_function_info import CppFreeFunctionInfo
 from cppwg.utils import utils
@@ -21,11 +21,15 @@ class CppFreeFunctionWrapperWriter(CppBaseWrapperWriter):
         A list of argument types to exclude from the wrapper code
     """
 
+    __slots__ = (
+        "free_function_info",
+        "exclusion_args",
+    )
+
     def __init__(self, free_function_info, wrapper_templates) -> None:
         super().__init__(wrapper_templates)
 
         self.free_function_info: CppFreeFunctionInfo = free_function_info
-        self.wrapper_templates: Dict[str, str] = wrapper_templates
         self.exclusion_args: List[str] = []
 
     def generate_wrapper(self) -> str:
@@ -47,10 +51,10 @@ class CppFreeFunctionWrapperWriter(CppBaseWrapperWriter):
         # Pybind11 arg string with or without default values.
         # e.g. without default values: ', py::arg("foo"), py::arg("bar")'
         # e.g. with default values: ', py::arg("foo") = 1, py::arg("bar") = 2'
-        default_args = ""
+        default_args: List[str] = []
         if not self.free_function_info.hierarchy_attribute("exclude_default_args"):
             for arg in self.free_function_info.decls[0].arguments:
-                default_args += f', py::arg("{arg.name}")'
+                default_args.append(f', py::arg("{arg.name}")')
                 if arg.default_value is not None:
                     # Try to convert "(-1)" to "-1" etc.
                     default_value = str(arg.default_value)
@@ -59,16 +63,16 @@ class CppFreeFunctionWrapperWriter(CppBaseWrapperWriter):
                     )
                     if value is not None:
                         default_value = str(value)
-                    default_args += f" = {default_value}"
+                    default_args.append(f" = {default_value}")
 
         # Add the free function wrapper code to the wrapper string
         func_dict = {
             "def_adorn": def_adorn,
             "function_name": self.free_function_info.decls[0].name,
             "function_docs": '" "',
-            "default_args": default_args,
+            "default_args": "".join(default_args),
         }
-        wrapper_string = self.wrapper_templates["free_function"].format(**func_dict)
+        wrapper_string = self.fill_template("free_function", func_dict)
 
         return wrapper_string
 
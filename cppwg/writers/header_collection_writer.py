@@ -1,11 +1,12 @@
 """Writer for header collection hpp file."""
 
 import os
-from typing import Dict
+from typing import Dict, List
 
 from cppwg.info.class_info import CppClassInfo
 from cppwg.info.free_function_info import CppFreeFunctionInfo
 from cppwg.info.package_info import PackageInfo
+from cppwg.utils import utils
 
 
 class CppHeaderCollectionWriter:
@@ -71,52 +72,33 @@ class CppHeaderCollectionWriter:
 
     def write(self) -> None:
         """Generate the header file output string and write it to file."""
+        hpp_parts: List[str] = []
+
         # Add the top prefix text
         prefix_text = self.package_info.hierarchy_attribute("prefix_text")
         if prefix_text:
-            self.hpp_collection += prefix_text + "\n"
+            hpp_parts.append(prefix_text + "\n")
 
         # Add opening header guard
-        self.hpp_collection += f"#ifndef {self.package_info.name}_HEADERS_HPP_\n"
-        self.hpp_collection += f"#define {self.package_info.name}_HEADERS_HPP_\n"
-
-        self.hpp_collection += "\n// Includes\n"
-
-        seen_files = set()  # Keep track of included files to avoid duplicates
-
-        if self.should_include_all():
+        hpp_parts.append(f"#ifndef {self.package_info.name}_HEADERS_HPP_\n")
+        hpp_parts.append(f"#define {self.package_info.name}_HEADERS_HPP_\n")
+
+        # Collect the included file names, the template instantiations
+        # e.g. `template class Foo<2,2>;` and typedefs e.g. `typedef Foo<2,2> Foo_2_2;`
+        # in one pass over the classes. File names are dict keys, which skips
+        # duplicates and keeps the first occurrence of each name, in order.
+        include_all = self.should_include_all()
+        basename = os.path.basename
+
+        include_files: Dict[str, None] = {}
+        if include_all:
             # Include all the headers
-            for filepath in self.package_info.source_hpp_files:
-                filename = os.path.basename(filepath)
-                if filename not in seen_files:
-                    self.hpp_collection += f'#include "{filename}"\n'
-                    seen_files.add(filename)
-
-        else:
-            # Include specific headers needed by classes
-            for module_info in self.package_info.module_collection:
-                for class_info in module_info.class_collection:
-                    # Skip excluded classes
-                    if class_info.excluded:
-                        continue
-
-                    filename = class_info.source_file
-                    if filename and filename not in seen_files:
-                        self.hpp_collection += f'#include "{filename}"\n'
-                        seen_files.add(filename)
-
-                # Include specific headers needed by free functions
-                for free_function_info in module_info.free_function_collection:
-                    if free_function_info.source_file_path:
-                        filename = os.path.basename(free_function_info.source_file_path)
-                        if filename not in seen_files:
-                            self.hpp_collection += f'#include "{filename}"\n'
-                            seen_files.add(filename)
+            include_files = dict.fromkeys(
+                map(basename, self.package_info.source_hpp_files)
+            )
 
-        # Add the template instantiations e.g. `template class Foo<2,2>;`
-        # and typdefs e.g. `typedef Foo<2,2> Foo_2_2;`
-        template_instantiations = ""
-        template_typedefs = ""
+        template_instantiations: List[str] = []
+        template_typedefs: List[str] = []
 
         for module_info in self.package_info.module_collection:
             for class_info in module_info.class_collection:
@@ -124,31 +106,43 @@ class CppHeaderCollectionWriter:
                 if class_info.excluded:
                     continue
 
+                # Include specific headers needed by classes
+                if not include_all and class_info.source_file:
+                    include_files.setdefault(class_info.source_file)
+
                 # Skip untemplated classes
                 if not class_info.template_arg_lists:
                     continue
 
-                # C++ class names eg. ["Foo<2,2>", "Foo<3,3>"]
-                cpp_names = [name.strip() for name in class_info.cpp_names]
+                # C++ class names eg. "Foo<2,2>" and Python names eg. "Foo_2_2"
+                for cpp_name, py_name in zip(class_info.cpp_names, class_info.py_names):
+                    cpp_name = cpp_name.strip()
+                    py_name = py_name.strip()
+                    template_instantiations.append(f"template class {cpp_name};\n")
+                    template_typedefs.append(f"    typedef {cpp_name} {py_name};\n")
 
-                # Python class names eg. ["Foo_2_2", "Foo_3_3"]
-                py_names = [name.strip() for name in class_info.py_names]
+            # Include specific headers needed by free functions
+            if not include_all:
+                for free_function_info in module_info.free_function_collection:
+                    if free_function_info.source_file_path:
+                        filename = basename(free_function_info.source_file_path)
+                        include_files.setdefault(filename)
 
-                for cpp_name, py_name in zip(cpp_names, py_names):
-                    template_instantiations += f"template class {cpp_name};\n"
-                    template_typedefs += f"    typedef {cpp_name} {py_name};\n"
+        hpp_parts.append("\n// Includes\n")
+        hpp_parts.extend(f'#include "{filename}"\n' for filename in include_files)
 
-        self.hpp_collection += "\n// Instantiate Template Classes\n"
-        self.hpp_collection += template_instantiations
+        hpp_parts.append("\n// Instantiate Template Classes\n")
+        hpp_parts.extend(template_instantiations)
 
-        self.hpp_collection += "\n// Typedefs for nicer naming\n"
-        self.hpp_collection += "namespace cppwg\n{\n"
-        self.hpp_collection += template_typedefs
-        self.hpp_collection += "} // namespace cppwg\n"
+        hpp_parts.append("\n// Typedefs for nicer naming\n")
+        hpp_parts.append("namespace cppwg\n{\n")
+        hpp_parts.extend(template_typedefs)
+        hpp_parts.append("} // namespace cppwg\n")
 
         # Add closing header guard
-        self.hpp_collection += f"\n#endif // {self.package_info.name}_HEADERS_HPP_\n"
+        hpp_parts.append(f"\n#endif // {self.package_info.name}_HEADERS_HPP_\n")
+
+        self.hpp_collection = "".join(hpp_parts)
 
         # Write the header collection string to file
-        with open(self.hpp_collection_file, "w") as hpp_file:
-            hpp_file.write(self.hpp_collection)
+        utils.write_source_file(self.hpp_collection_file, self.hpp_collection)
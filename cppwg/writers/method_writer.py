@@ -1,12 +1,14 @@
 """Wrapper code writer for C++ methods."""
 
-import re
-from typing import Dict
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from pygccxml.declarations import type_traits
 
 from cppwg.utils import utils
-from cppwg.writers.base_writer import CppBaseWrapperWriter
+from cppwg.writers.base_writer import (
+    CppBaseWrapperWriter,
+    compile_template_arg_substitution,
+)
 
 
 class CppMethodWrapperWriter(CppBaseWrapperWriter):
@@ -31,14 +33,47 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         The template params for the class e.g. ['DIM_A', 'DIM_B']
     template_args: Optional[List[str]]
         The template args for the class e.g. ['2', '2']
+    return_type : str
+        The method return type e.g. 'unsigned int'
+    arg_types : List[str]
+        The method argument types e.g. ['int', 'bool']
+    calldef_excludes : FrozenSet[str]
+        Arg and return types to exclude, with spaces removed
+    return_type_excludes : FrozenSet[str]
+        Return types to exclude, with spaces removed
+    exclude_default_args : bool
+        Whether to leave out default arg values
+    pointer_call_policy : Optional[str]
+        The return value policy for methods returning pointers e.g. 'reference'
+    reference_call_policy : Optional[str]
+        The return value policy for methods returning references
     """
 
+    __slots__ = (
+        "class_info",
+        "method_decl",
+        "class_decl",
+        "class_py_name",
+        "template_params",
+        "template_args",
+        "return_type",
+        "arg_types",
+        "calldef_excludes",
+        "return_type_excludes",
+        "exclude_default_args",
+        "pointer_call_policy",
+        "reference_call_policy",
+    )
+
     def __init__(
         self,
         class_info: "CppClassInfo",  # noqa: F821
         template_idx: int,
         method_decl: "member_function_t",  # noqa: F821
         wrapper_templates: Dict[str, str],
+        excludes: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+        exclude_default_args: Optional[bool] = None,
+        call_policies: Optional[Tuple[Optional[str], Optional[str]]] = None,
     ) -> None:
         super().__init__(wrapper_templates)
 
@@ -56,6 +91,85 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         if class_info.template_arg_lists:
             self.template_args = class_info.template_arg_lists[template_idx]
 
+        # Type strings are formatted on each access, so get them once
+        self.return_type: str = method_decl.return_type.decl_string
+        # Read the types from the args directly, as argument_types builds a
+        # new list on each access
+        self.arg_types: List[str] = [
+            arg.decl_type.decl_string for arg in method_decl.arguments
+        ]
+
+        # Exclude patterns may be gathered once per class and passed in
+        if excludes is None:
+            excludes = self.gather_excludes(class_info)
+
+        self.calldef_excludes, self.return_type_excludes = excludes
+
+        # Whether to drop default arg values, which may be looked up once per
+        # class and passed in
+        if exclude_default_args is None:
+            exclude_default_args = bool(
+                class_info.hierarchy_attribute("exclude_default_args")
+            )
+        self.exclude_default_args: bool = exclude_default_args
+
+        # Call policies may be gathered once per class and passed in
+        if call_policies is None:
+            call_policies = self.gather_call_policies(class_info)
+
+        self.pointer_call_policy, self.reference_call_policy = call_policies
+
+    @staticmethod
+    def gather_excludes(
+        class_info: "CppClassInfo",  # noqa: F821
+    ) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Gather method exclude patterns for a class from the info tree.
+
+        Parameters
+        ----------
+        class_info : CppClassInfo
+            The class information
+
+        Returns
+        -------
+        Tuple[FrozenSet[str], FrozenSet[str]]
+            The calldef_excludes and return_type_excludes, with spaces removed
+        """
+        calldef_excludes = frozenset(
+            x.replace(" ", "")
+            for x in class_info.hierarchy_attribute_gather("calldef_excludes")
+        )
+
+        return_type_excludes = frozenset(
+            x.replace(" ", "")
+            for x in class_info.hierarchy_attribute_gather("return_type_excludes")
+        )
+
+        return calldef_excludes, return_type_excludes
+
+    @staticmethod
+    def gather_call_policies(
+        class_info: "CppClassInfo",  # noqa: F821
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Gather the method return value policies for a class from the info tree.
+
+        Parameters
+        ----------
+        class_info : CppClassInfo
+            The class information
+
+        Returns
+        -------
+        Tuple[Optional[str], Optional[str]]
+            The pointer_call_policy and reference_call_policy
+        """
+        return (
+            class_info.hierarchy_attribute("pointer_call_policy"),
+            class_info.hierarchy_attribute("reference_call_policy"),
+        )
+
     def exclude(self) -> bool:
         """
         Check if the method should be excluded from the wrapper code.
@@ -82,30 +196,23 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
             return True
 
         # Check for excluded return types
-        calldef_excludes = [
-            x.replace(" ", "")
-            for x in self.class_info.hierarchy_attribute_gather("calldef_excludes")
-        ]
-
-        return_type_excludes = [
-            x.replace(" ", "")
-            for x in self.class_info.hierarchy_attribute_gather("return_type_excludes")
-        ]
-
-        return_type = self.method_decl.return_type.decl_string.replace(" ", "")
-        if return_type in calldef_excludes or return_type in return_type_excludes:
+        return_type = self.return_type.replace(" ", "")
+        if (
+            return_type in self.calldef_excludes
+            or return_type in self.return_type_excludes
+        ):
             return True
 
         # Check for excluded argument patterns
-        for argument_type in self.method_decl.argument_types:
+        for arg_type in self.arg_types:
             # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsigned
-            arg_type_short = argument_type.decl_string.split()[0].replace(" ", "")
-            if arg_type_short in calldef_excludes:
+            arg_type_short = arg_type.split()[0].replace(" ", "")
+            if arg_type_short in self.calldef_excludes:
                 return True
 
             # e.g. ::std::vector<unsigned int> const & -> ::std::vector<unsignedint>const&
-            arg_type_full = argument_type.decl_string.replace(" ", "")
-            if arg_type_full in calldef_excludes:
+            arg_type_full = arg_type.replace(" ", "")
+            if arg_type_full in self.calldef_excludes:
                 return True
 
         return False
@@ -144,70 +251,57 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
             const_adorn = " const"
 
         # Get the arg signature e.g. "int, bool"
-        arg_types = [t.decl_string for t in self.method_decl.argument_types]
-        arg_signature = ", ".join(arg_types)
+        arg_signature = ", ".join(self.arg_types)
+
+        substitute_template_args = None
+        if self.template_params:
+            substitute_template_args = compile_template_arg_substitution(
+                self.class_info.name,
+                tuple(self.template_params),
+                tuple(str(arg) for arg in self.template_args),
+            )
 
         # Keyword args with default values e.g. py::arg("i") = 1
-        keyword_args = ""
-        for arg in self.method_decl.arguments:
-            keyword_args += f', py::arg("{arg.name}")'
-
-            if not (
-                arg.default_value is None
-                or self.class_info.hierarchy_attribute("exclude_default_args")
-            ):
+        keyword_args: List[str] = []
+        for arg, arg_type in zip(self.method_decl.arguments, self.arg_types):
+            keyword_args.append(f', py::arg("{arg.name}")')
+
+            if not (arg.default_value is None or self.exclude_default_args):
                 # Try to convert "(-1)" to "-1" etc.
                 default_value = str(arg.default_value)
-                value = utils.str_to_num(
-                    default_value, integer="int" in str(arg.decl_type)
-                )
+                value = utils.str_to_num(default_value, integer="int" in arg_type)
                 if value is not None:
                     default_value = str(value)
 
-                # Check for template params in default value
-                if self.template_params:
-                    for param, val in zip(self.template_params, self.template_args):
-                        if param in default_value:
-                            # Replace e.g. Foo::DIM_A -> 2
-                            default_value = re.sub(
-                                f"\\b{self.class_info.name}::{param}\\b",
-                                str(val),
-                                default_value,
-                            )
-
-                            # Replace e.g. <DIM_A> -> <2>
-                            default_value = re.sub(
-                                f"\\b{param}\\b", f"{val}", default_value
-                            )
+                # Replace template params in default value e.g. Foo::DIM_A -> 2
+                if substitute_template_args:
+                    default_value = substitute_template_args(default_value)
 
-                keyword_args += f" = {default_value}"
+                keyword_args.append(f" = {default_value}")
 
         # Call policy, e.g. "py::return_value_policy::reference"
         call_policy = ""
         if type_traits.is_pointer(self.method_decl.return_type):
-            ptr_policy = self.class_info.hierarchy_attribute("pointer_call_policy")
-            if ptr_policy:
-                call_policy = f", py::return_value_policy::{ptr_policy}"
+            if self.pointer_call_policy:
+                call_policy = f", py::return_value_policy::{self.pointer_call_policy}"
 
         elif type_traits.is_reference(self.method_decl.return_type):
-            ref_policy = self.class_info.hierarchy_attribute("reference_call_policy")
-            if ref_policy:
-                call_policy = f", py::return_value_policy::{ref_policy}"
+            if self.reference_call_policy:
+                call_policy = f", py::return_value_policy::{self.reference_call_policy}"
 
         method_dict = {
             "def_adorn": def_adorn,
             "method_name": self.method_decl.name,
-            "return_type": self.method_decl.return_type.decl_string,
+            "return_type": self.return_type,
             "self_ptr": self_ptr,
             "arg_signature": arg_signature,
             "const_adorn": const_adorn,
             "class_py_name": self.class_py_name,
             "method_docs": '" "',
-            "default_args": keyword_args,
+            "default_args": "".join(keyword_args),
             "call_policy": call_policy,
         }
-        class_method_template = self.wrapper_templates["class_method"]
-        wrapper_string = class_method_template.format(**method_dict)
+        wrapper_string = self.fill_template("class_method", method_dict)
 
         return wrapper_string
 
@@ -235,21 +329,17 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
         if self.exclude():
             return ""
 
-        # Get list of arguments and types
-        arg_list = []
-        arg_name_list = []
+        # Get the arguments with and without types
+        arg_names = [arg.name for arg in self.method_decl.arguments]
 
-        for i, (arg, arg_type) in enumerate(
-            zip(self.method_decl.arguments, self.method_decl.argument_types)
-        ):
-            arg_list.append(f"{arg_type.decl_string} {arg.name}")
-            if i == 0:
-                arg_name_list.append(f"{arg.name}")
-            else:
-                arg_name_list.append(" " * 12 + f"{arg.name}")
+        # e.g. "int a, bool b, double c"
+        arg_string = ", ".join(
+            f"{arg_type} {arg_name}"
+            for arg_type, arg_name in zip(self.arg_types, arg_names)
+        )
 
-        arg_string = ", ".join(arg_list)  # e.g. "int a, bool b, double c"
-        arg_name_string = ",\n".join(arg_name_list)  # e.g. "a,\n b,\n c"
+        # e.g. "a,\n            b,\n            c"
+        arg_name_string = (",\n" + " " * 12).join(arg_names)
 
         # Const-ness
         const_adorn = ""
@@ -262,7 +352,7 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
             overload_adorn = "_PURE"
 
         # Get the return type e.g. "void"
-        return_string = self.method_decl.return_type.decl_string
+        return_string = self.return_type
 
         # Add the override code from the template
         override_dict = {
@@ -275,8 +365,6 @@ class CppMethodWrapperWriter(CppBaseWrapperWriter):
             "class_py_name": self.class_py_name,
             "args_string": arg_name_string,
         }
-        wrapper_string = self.wrapper_templates["method_virtual_override"].format(
-            **override_dict
-        )
+        wrapper_string = self.fill_template("method_virtual_override", override_dict)
 
         return wrapper_string
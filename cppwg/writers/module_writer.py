@@ -1,13 +1,94 @@
 """Wrapper code writer for modules."""
 
 import logging
+import multiprocessing
 import os
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
 
+from cppwg.utils import utils
 from cppwg.utils.constants import CPPWG_EXT, CPPWG_HEADER_COLLECTION_FILENAME
 from cppwg.writers.class_writer import CppClassWrapperWriter
 from cppwg.writers.free_function_writer import CppFreeFunctionWrapperWriter
 
+# The module writers whose class wrappers are being written by worker processes.
+# Workers are forked, so they inherit them (and their parsed declarations) from
+# the parent process instead of receiving pickled copies.
+_forked_module_writers: List["CppModuleWrapperWriter"] = []
+
+
+def _write_forked_class_wrapper(task: Tuple[int, int]) -> None:
+    """
+    Write wrappers for a class in a forked worker process.
+
+    Parameters
+    ----------
+    task : Tuple[int, int]
+        The index of the module writer, and of the class in its class collection
+    """
+    module_idx, class_idx = task
+    module_writer = _forked_module_writers[module_idx]
+    class_info = module_writer.module_info.class_collection[class_idx]
+    module_writer.write_class_wrapper(class_info)
+
+
+def write_class_wrappers(
+    module_writers: List["CppModuleWrapperWriter"], jobs: int = 1
+) -> None:
+    """
+    Write wrappers for the classes of one or more modules.
+
+    If more than one job is requested, the classes of all the modules are
+    shared out among one pool of forked worker processes. Each class writes
+    its own files, so the classes can be written in any order.
+
+    Parameters
+    ----------
+    module_writers : List[CppModuleWrapperWriter]
+        The writers for the modules whose classes are to be written
+    jobs : int
+        The number of worker processes to use
+    """
+    global _forked_module_writers
+
+    logger = logging.getLogger()
+
+    tasks: List[Tuple[int, int]] = []
+    for module_idx, module_writer in enumerate(module_writers):
+        for class_idx, class_info in enumerate(
+            module_writer.module_info.class_collection
+        ):
+            # Skip excluded classes
+            if class_info.excluded:
+                logger.info(f"Skipping class {class_info.name}")
+                continue
+            tasks.append((module_idx, class_idx))
+
+    jobs = min(jobs, len(tasks))
+
+    if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Cannot fork worker processes - writing classes serially")
+        jobs = 1
+
+    if jobs <= 1:
+        for module_idx, class_idx in tasks:
+            module_writer = module_writers[module_idx]
+            module_writer.write_class_wrapper(
+                module_writer.module_info.class_collection[class_idx]
+            )
+        return
+
+    _forked_module_writers = module_writers
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            # Consume the results to raise any errors from the workers
+            for _ in executor.map(_write_forked_class_wrapper, tasks):
+                pass
+    finally:
+        _forked_module_writers = []
+
 
 class CppModuleWrapperWriter:
     """
@@ -26,6 +107,10 @@ class CppModuleWrapperWriter:
         String templates with placeholders for generating wrapper code
     wrapper_root : str
         The output directory for the generated wrapper code
+    jobs : int
+        The number of worker processes for writing class wrappers
+    module_dir : str
+        The output directory for the module e.g. /path/to/wrapper_root/modulename
 
     classes : Dict[pygccxml.declarations.class_t, str]
         A dictionary of decls and names for all classes to be wrapped in the module
@@ -36,10 +121,15 @@ class CppModuleWrapperWriter:
         module_info: "ModuleInfo",  # noqa: F821
         wrapper_templates: Dict[str, str],
         wrapper_root: str,
+        jobs: int = 1,
     ):
         self.module_info: "ModuleInfo" = module_info  # noqa: F821
         self.wrapper_templates: Dict[str, str] = wrapper_templates
         self.wrapper_root: str = wrapper_root
+        self.jobs: int = jobs
+
+        # The module and class wrappers are written to wrapper_root/modulename/
+        self.module_dir: str = os.path.join(wrapper_root, module_info.name)
 
         # For convenience, store a dictionary of decl->name pairs for all
         # classes to be wrapped in the module
@@ -75,101 +165,121 @@ class CppModuleWrapperWriter:
         }
         ```
         """
-        cpp_string = ""
+        module_info = self.module_info
+        package_info = module_info.package_info
+        custom_generator = module_info.custom_generator_instance
+        cpp_parts: List[str] = []
 
         # Add the top prefix text
-        prefix_text = self.module_info.hierarchy_attribute("prefix_text")
+        prefix_text = module_info.hierarchy_attribute("prefix_text")
         if prefix_text:
-            cpp_string += prefix_text + "\n"
+            cpp_parts.append(prefix_text + "\n")
 
         # Add top level includes
-        cpp_string += "#include <pybind11/pybind11.h>\n"
+        cpp_parts.append("#include <pybind11/pybind11.h>\n")
 
-        if self.module_info.package_info.common_include_file:
-            cpp_string += f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n'
+        if package_info.common_include_file:
+            cpp_parts.append(f'#include "{CPPWG_HEADER_COLLECTION_FILENAME}"\n')
 
         # Add outputs from running custom generator code
-        if self.module_info.custom_generator_instance:
-            cpp_string += (
-                self.module_info.custom_generator_instance.get_module_pre_code()
-            )
+        if custom_generator:
+            cpp_parts.append(custom_generator.get_module_pre_code())
 
-        # Add includes for class wrappers in the module
-        for class_info in self.module_info.class_collection:
-            # Skip excluded classes
-            if class_info.excluded:
-                continue
+        # Python names of the classes to register e.g. ["Foo_2_2", "Foo_3_3", "Bar"]
+        class_py_names = [
+            py_name
+            for class_info in module_info.class_collection
+            if not class_info.excluded
+            for py_name in class_info.py_names
+        ]
 
-            for py_name in class_info.py_names:
-                # Example: #include "Foo_2_2.cppwg.hpp"
-                cpp_string += f'#include "{py_name}.{CPPWG_EXT}.hpp"\n'
+        # Add includes for class wrappers in the module
+        # Example: #include "Foo_2_2.cppwg.hpp"
+        ext = CPPWG_EXT
+        cpp_parts.append(
+            "".join(f'#include "{py_name}.{ext}.hpp"\n' for py_name in class_py_names)
+        )
 
         # Format module name as _packagename_modulename
-        full_module_name = (
-            f"_{self.module_info.package_info.name}_{self.module_info.name}"
-        )
+        full_module_name = f"_{package_info.name}_{module_info.name}"
 
         # Create the pybind11 module
-        cpp_string += "\nnamespace py = pybind11;\n"
-        cpp_string += f"\nPYBIND11_MODULE({full_module_name}, m)\n"
-        cpp_string += "{\n"
-
-        # Add free functions
-        for free_function_info in self.module_info.free_function_collection:
+        cpp_parts.append("\nnamespace py = pybind11;\n")
+        cpp_parts.append(f"\nPYBIND11_MODULE({full_module_name}, m)\n")
+        cpp_parts.append("{\n")
+
+        # Add free functions. The writer only holds the wrapper templates and
+        # the current free function info, so one writer is reused for all.
+        free_function_collection = module_info.free_function_collection
+        if free_function_collection:
             function_writer = CppFreeFunctionWrapperWriter(
-                free_function_info, self.wrapper_templates
+                free_function_collection[0], self.wrapper_templates
             )
-            cpp_string += function_writer.generate_wrapper()
 
-        # Add classes
-        for class_info in self.module_info.class_collection:
-            # Skip excluded classes
-            if class_info.excluded:
-                continue
+            # Overloads discovered with `use_all_free_functions` give several
+            # infos that share the first declaration of their name. The wrapper
+            # only depends on the declaration, so generate it once per decl.
+            wrappers: Dict[int, str] = {}
+            for free_function_info in free_function_collection:
+                decl_id = id(free_function_info.decls[0])
+                wrapper = wrappers.get(decl_id)
+                if wrapper is None:
+                    function_writer.free_function_info = free_function_info
+                    wrapper = function_writer.generate_wrapper()
+                    wrappers[decl_id] = wrapper
+                cpp_parts.append(wrapper)
 
-            for py_name in class_info.py_names:
-                # Example: register_Foo_2_2_class(m);"
-                cpp_string += f"    register_{py_name}_class(m);\n"
+        # Add classes
+        # Example: register_Foo_2_2_class(m);"
+        cpp_parts.append(
+            "".join(f"    register_{py_name}_class(m);\n" for py_name in class_py_names)
+        )
 
         # Add code from the module's custom generator
-        if self.module_info.custom_generator_instance:
-            cpp_string += self.module_info.custom_generator_instance.get_module_code()
+        if custom_generator:
+            cpp_parts.append(custom_generator.get_module_code())
 
-        cpp_string += "}\n"  # End of the pybind11 module
+        cpp_parts.append("}\n")  # End of the pybind11 module
 
         # Write to /path/to/wrapper_root/modulename/modulename.main.cpp
-        module_dir = os.path.join(self.wrapper_root, self.module_info.name)
-        if not os.path.isdir(module_dir):
-            os.makedirs(module_dir)
+        os.makedirs(self.module_dir, exist_ok=True)
 
         module_cpp_file = os.path.join(
-            module_dir, f"{full_module_name}.main.{CPPWG_EXT}.cpp"
+            self.module_dir, f"{full_module_name}.main.{CPPWG_EXT}.cpp"
         )
 
-        with open(module_cpp_file, "w") as out_file:
-            out_file.write(cpp_string)
+        utils.write_source_file(module_cpp_file, "".join(cpp_parts))
 
-    def write_class_wrappers(self) -> None:
-        """Write wrappers for classes in the module."""
+    def write_class_wrapper(self, class_info: "CppClassInfo") -> None:  # noqa: F821
+        """
+        Write wrappers for a class in the module.
+
+        Parameters
+        ----------
+        class_info : CppClassInfo
+            The class to write wrappers for
+        """
         logger = logging.getLogger()
 
-        for class_info in self.module_info.class_collection:
-            # Skip excluded classes
-            if class_info.excluded:
-                logger.info(f"Skipping class {class_info.name}")
-                continue
+        logger.info(f"Generating wrappers for class {class_info.name}")
 
-            logger.info(f"Generating wrappers for class {class_info.name}")
+        class_writer = CppClassWrapperWriter(
+            class_info,
+            self.wrapper_templates,
+            self.classes,
+        )
 
-            class_writer = CppClassWrapperWriter(
-                class_info,
-                self.wrapper_templates,
-                self.classes,
-            )
+        # Write the class wrappers into /path/to/wrapper_root/modulename/
+        class_writer.write(self.module_dir)
 
-            # Write the class wrappers into /path/to/wrapper_root/modulename/
-            module_dir = os.path.join(self.wrapper_root, self.module_info.name)
-            class_writer.write(module_dir)
+    def write_class_wrappers(self) -> None:
+        """
+        Write wrappers for classes in the module.
+
+        If more than one job is requested, the classes are shared out among
+        forked worker processes.
+        """
+        write_class_wrappers([self], self.jobs)
 
     def write(self) -> None:
         """Generate the module and class wrappers."""
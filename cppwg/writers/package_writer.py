@@ -1,8 +1,9 @@
 """Wrapper code writer for the package."""
 
-from typing import Dict
+import logging
+from typing import Dict, List
 
-from cppwg.writers.module_writer import CppModuleWrapperWriter
+from cppwg.writers.module_writer import CppModuleWrapperWriter, write_class_wrappers
 
 
 class CppPackageWrapperWriter:
@@ -17,6 +18,8 @@ class CppPackageWrapperWriter:
         String templates with placeholders for generating wrapper code
     wrapper_root : str
         The output directory for the generated wrapper code
+    jobs : int
+        The number of worker processes for writing class wrappers
     """
 
     def __init__(
@@ -24,19 +27,43 @@ class CppPackageWrapperWriter:
         package_info: "PackageInfo",  # noqa: F821
         wrapper_templates: Dict[str, str],
         wrapper_root: str,
+        jobs: int = 1,
     ):
         self.package_info = package_info
         self.wrapper_templates = wrapper_templates
         self.wrapper_root = wrapper_root
+        self.jobs = jobs
 
     def write(self) -> None:
         """
         Write all the wrappers required for the package.
+
+        If more than one job is requested, the module wrappers are written
+        first, then the classes of all modules are written by one shared pool
+        of worker processes. This keeps every worker busy even when modules
+        have only a few classes each.
         """
-        for module_info in self.package_info.module_collection:
-            module_writer = CppModuleWrapperWriter(
+        module_writers: List[CppModuleWrapperWriter] = [
+            CppModuleWrapperWriter(
                 module_info,
                 self.wrapper_templates,
                 self.wrapper_root,
+                self.jobs,
+            )
+            for module_info in self.package_info.module_collection
+        ]
+
+        if self.jobs <= 1:
+            for module_writer in module_writers:
+                module_writer.write()
+            return
+
+        logger = logging.getLogger()
+
+        for module_writer in module_writers:
+            logger.info(
+                f"Generating wrappers for module {module_writer.module_info.name}"
             )
-            module_writer.write()
+            module_writer.write_module_wrapper()
+
+        write_class_wrappers(module_writers, self.jobs)
@@ -1,24 +1,52 @@
-import inspect
-from collections.abc import Iterable
+def _as_tuple(args):
+    """Return the template args as a tuple e.g. 2 -> (2,)."""
+    if isinstance(args, tuple):
+        return args
+    if isinstance(args, list) or (
+        hasattr(args, "__iter__") and not isinstance(args, (str, type))
+    ):
+        return tuple(args)
+    return (args,)
 
 
 class TemplateClassDict:
+    __slots__ = ("_dict", "_cache")
+
     def __init__(self, template_dict):
         self._dict = {}
-        for arg_tuple, cls in template_dict.items():
-            if not inspect.isclass(cls):
+
+        # Classes already looked up, keyed by the args and their types, as equal
+        # args can give different keys e.g. 2.0 == 2 but str(2.0) != str(2)
+        self._cache = {}
+
+        for args, cls in template_dict.items():
+            if not isinstance(cls, type):
                 raise TypeError("Expected class, got {}".format(type(cls)))
-            if not isinstance(arg_tuple, Iterable):
-                arg_tuple = (arg_tuple,)
             key = tuple(
-                arg.__name__ if inspect.isclass(arg) else str(arg) for arg in arg_tuple
+                arg.__name__ if isinstance(arg, type) else str(arg)
+                for arg in _as_tuple(args)
             )
             self._dict[key] = cls
 
     def __getitem__(self, arg_tuple):
-        if not isinstance(arg_tuple, Iterable):
-            arg_tuple = (arg_tuple,)
+        if isinstance(arg_tuple, tuple):
+            cache_key = (tuple, *map(type, arg_tuple), *arg_tuple)
+        else:
+            cache_key = (type(arg_tuple), arg_tuple)
+
+        try:
+            return self._cache[cache_key]
+        except (KeyError, TypeError):  # TypeError for unhashable args e.g. lists
+            pass
+
         key = tuple(
-            arg.__name__ if inspect.isclass(arg) else str(arg) for arg in arg_tuple
+            arg.__name__ if isinstance(arg, type) else str(arg)
+            for arg in _as_tuple(arg_tuple)
         )
-        return self._dict[key]
+        cls = self._dict[key]
+
+        try:
+            self._cache[cache_key] = cls
+        except TypeError:
+            pass
+        return cls
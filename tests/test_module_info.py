@@ -0,0 +1,143 @@
+import unittest
+from types import SimpleNamespace
+
+from cppwg.info.class_info import CppClassInfo
+from cppwg.info.module_info import ModuleInfo
+
+
+class StubClassInfo(CppClassInfo):
+    """Class info with dependencies given by name instead of parsed decls."""
+
+    def __init__(self, name, extends=(), requires=()):
+        super().__init__(name)
+        self.extends_names = set(extends)
+        self.requires_names = set(requires)
+
+    def extends(self, other):
+        return other.name in self.extends_names
+
+    def requires(self, other):
+        return other.name in self.requires_names
+
+
+class FakeClassDecl:
+    """Class declaration with just the parts of pygccxml's class_t that are used."""
+
+    def __init__(self, name, bases=(), arg_types=()):
+        self.name = name
+        self.bases = [SimpleNamespace(related_class=base) for base in bases]
+        self.location = SimpleNamespace(file_name=name + ".hpp")
+        self.calls = 0
+        self.method = SimpleNamespace(
+            argument_types=[SimpleNamespace(decl_string=t) for t in arg_types]
+        )
+
+    def member_functions(self, function=None, allow_empty=False):
+        self.calls += 1
+        return [self.method]
+
+    def constructors(self, function=None, allow_empty=False):
+        return []
+
+
+class FakeNamespace:
+    """Namespace that looks up fake class declarations by name."""
+
+    def __init__(self, *class_decls):
+        self.class_decls = {decl.name: decl for decl in class_decls}
+
+    def class_(self, name):
+        return self.class_decls[name]
+
+
+def make_class_info(name, source_ns):
+    class_info = CppClassInfo(name)
+    class_info.cpp_names = [name]
+    class_info.py_names = [name]
+    class_info.update_from_ns(source_ns)
+    return class_info
+
+
+class TestSortClasses(unittest.TestCase):
+    def sorted_names(self, class_infos):
+        module_info = ModuleInfo("module")
+        for class_info in class_infos:
+            module_info.add_class(class_info)
+        module_info.sort_classes()
+        return [class_info.name for class_info in module_info.class_collection]
+
+    def testBaseBeforeDerived(self):
+        class_infos = [
+            StubClassInfo("Derived", extends=["Base"]),
+            StubClassInfo("Base"),
+        ]
+        self.assertEqual(self.sorted_names(class_infos), ["Base", "Derived"])
+
+    def testExtendsWithReverseRequires(self):
+        # Base has a method taking Derived, so the two classes depend on each
+        # other in opposite directions. Sorting must still terminate, with the
+        # same order every time.
+        class_infos = [
+            StubClassInfo("Derived", extends=["Base"]),
+            StubClassInfo("Base", requires=["Derived"]),
+        ]
+        names = self.sorted_names(class_infos)
+        self.assertCountEqual(names, ["Base", "Derived"])
+        self.assertEqual(self.sorted_names(class_infos[::-1]), names)
+
+
+class TestClassDependencies(unittest.TestCase):
+    def setUp(self):
+        self.base_decl = FakeClassDecl("Base", arg_types=["int"])
+        self.derived_decl = FakeClassDecl(
+            "Derived", bases=[self.base_decl], arg_types=["::Base const &"]
+        )
+        self.source_ns = FakeNamespace(self.base_decl, self.derived_decl)
+
+        self.base = make_class_info("Base", self.source_ns)
+        self.derived = make_class_info("Derived", self.source_ns)
+
+    def testExtends(self):
+        self.assertTrue(self.derived.extends(self.base))
+        self.assertFalse(self.base.extends(self.derived))
+        self.assertEqual(self.derived._extends_cache, {"Base": True})
+
+    def testRequiresIsMemoized(self):
+        self.assertTrue(self.derived.requires(self.base))
+        self.assertTrue(self.derived.requires(self.base))
+        self.assertFalse(self.base.requires(self.derived))
+
+        # The arg types are collected once per class, not once per call
+        self.assertEqual(self.derived_decl.calls, 1)
+        self.assertEqual(self.derived._requires_cache, {"Base": True})
+
+    def testUpdateFromNsClearsCaches(self):
+        self.assertTrue(self.derived.extends(self.base))
+        self.assertTrue(self.derived.requires(self.base))
+
+        # Derived no longer extends or takes Base in the new namespace
+        new_derived_decl = FakeClassDecl("Derived", arg_types=["int"])
+        self.derived.decls = []
+        self.derived.update_from_ns(FakeNamespace(self.base_decl, new_derived_decl))
+
+        self.assertEqual(self.derived._extends_cache, {})
+        self.assertEqual(self.derived._requires_cache, {})
+        self.assertFalse(self.derived.extends(self.base))
+        self.assertFalse(self.derived.requires(self.base))
+
+
+class TestSourcePath(unittest.TestCase):
+    def testSourceLocationsChangedAfterInit(self):
+        module_info = ModuleInfo("module")
+        self.assertTrue(module_info.is_file_in_source_path("/src/a/foo.hpp"))
+
+        module_info.source_locations = ["/src/a"]
+        self.assertTrue(module_info.is_file_in_source_path("/src/a/foo.hpp"))
+        self.assertFalse(module_info.is_file_in_source_path("/src/b/foo.hpp"))
+
+        module_info.source_locations.append("/src/b")
+        self.assertTrue(module_info.is_file_in_source_path("/src/b/foo.hpp"))
+
+
+if __name__ == "__main__":
+    unittest.main()